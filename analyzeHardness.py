@@ -0,0 +1,123 @@
+"""Per-model hardness columns of ModelHardness.csv, from every year's resolution.csv.
+
+It replaces analyzeHardness.R. For each year and category, <category>BVT<year>
+is the number of resolution rows of the model and <category>SOL<year> the sum of
+their Solutions; 0 when the model has no row, NA when it is not in the year's
+models.csv. The model keys of ModelDescriptions.csv are encoded to integers
+once, and each resolution.csv is reduced to two bincounts over these codes,
+instead of one left_join / group_by / summarise of the whole description table
+per file. The years are read concurrently (-j).
+
+The ModelDescriptions.csv columns are copied as read, missing values written NA.
+
+Run from the models folder, as the R script was: the years are the numbered
+folders of the website folder (default ..) that have a models.csv.
+
+Usage: python3 analyzeHardness.py [-website ..] [-j N]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from runReport import record
+
+MODEL_PARTS = ['ModelFamily', 'ModelType', 'ModelInstance']
+
+
+def read_strings(path, usecols=None):
+    # values as text, with readr's missing values ("" and "NA") as NA
+    return pd.read_csv(path, dtype=str, usecols=usecols, keep_default_na=False, na_values=['', 'NA'])
+
+
+def model_keys(df):
+    """Family-Type-Instance of each row; a missing part reads "NA", as with R's paste."""
+    parts = [df[col].fillna('NA') for col in MODEL_PARTS]
+    return parts[0] + '-' + parts[1] + '-' + parts[2]
+
+
+def year_categories(website, year):
+    """(category, path) of the resolution.csv files of a year, in R's list.files order."""
+    folder = os.path.join(website, str(year))
+    return [(c, os.path.join(folder, c, 'resolution.csv')) for c in sorted(os.listdir(folder))
+            if os.path.isfile(os.path.join(folder, c, 'resolution.csv'))]
+
+
+def year_columns(website, year, keys, copies):
+    """BVT and SOL columns of every category of a year, per distinct model key."""
+    categories = year_categories(website, year)
+    if not categories:
+        return {}
+    present = keys.isin(model_keys(read_strings(os.path.join(website, str(year), 'models.csv'))))
+    columns = {}
+    for category, path in categories:
+        resolution = read_strings(path, usecols=MODEL_PARTS + ['Solutions'])
+        codes = keys.get_indexer(model_keys(resolution))
+        known = codes >= 0
+        solutions = pd.to_numeric(resolution['Solutions'], errors='coerce').fillna(0).to_numpy()
+        # each description row of a duplicated key joins all the rows of the model
+        bvt = np.bincount(codes[known], minlength=len(keys)) * copies
+        sol = np.bincount(codes[known], weights=solutions[known], minlength=len(keys)) * copies
+        columns[f'{category}BVT{year}'] = pd.Series(bvt, dtype='float64').where(present)
+        columns[f'{category}SOL{year}'] = pd.Series(sol, dtype='float64').where(present)
+    return columns
+
+
+def r_number(values):
+    """Text of a numeric column as written by write_csv: integers without decimals, NA."""
+    text = values.map(repr)
+    whole = values.notna() & (values % 1 == 0)
+    text[whole] = values[whole].astype('int64').astype(str)
+    text[values.isna()] = 'NA'
+    return text
+
+
+def hardness_table(descriptions, website, years, jobs=1):
+    codes, uniques = pd.factorize(descriptions['Model'])
+    keys = pd.Index(uniques)
+    copies = np.bincount(codes[codes >= 0], minlength=len(keys))
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        per_year = list(pool.map(lambda year: year_columns(website, year, keys, copies), years))
+
+    # description columns, with ModelKey split in place as tidyr::separate does (extra pieces dropped)
+    parts = descriptions['Model'].str.split('-', expand=True).reindex(columns=range(3))
+    parts.columns = MODEL_PARTS
+    position = descriptions.columns.get_loc('Model')
+    table = pd.concat([descriptions.iloc[:, :position], parts, descriptions.iloc[:, position + 1:]], axis=1)
+
+    rows = np.where(codes >= 0, codes, 0)
+    columns = {}
+    for year in per_year:
+        for name, values in year.items():
+            values = values.iloc[rows].reset_index(drop=True)
+            values[codes < 0] = np.nan
+            columns[name] = r_number(values)
+    return pd.concat([table, pd.DataFrame(columns, index=table.index)], axis=1)
+
+
+def year_folders(website):
+    return sorted(int(d) for d in os.listdir(website)
+                  if d.isdigit() and os.path.isfile(os.path.join(website, d, 'models.csv')))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write ModelHardness.csv from ModelDescriptions.csv and every year's resolution.csv.")
+    ap.add_argument('-website', default='..', help="folder of the year folders (default: ..)")
+    ap.add_argument('-j', type=int, default=0, help="read N years concurrently (default 0 = all cores)")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    descriptions = read_strings('ModelDescriptions.csv')
+    years = year_folders(args.website)
+    table = hardness_table(descriptions, args.website, years, args.j or os.cpu_count() or 1)
+    table.to_csv('ModelHardness.csv', index=False, na_rep='NA')
+    print(f"Processed {len(table)} models over {len(years)} years in {time.time() - start_time:.2f} seconds.")
+    record('hardness', rows_out=len(table), years=len(years), seconds=time.time() - start_time)
+
+
+if __name__ == "__main__":
+    main()
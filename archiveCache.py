@@ -0,0 +1,159 @@
+"""Persistent, checksummed cache of the MCC raw-result-analysis archives.
+
+Each year's archive is downloaded once into <cache>/<year>/, as published
+(.zip, or .tar.gz when the .zip is missing), next to a manifest.json holding
+its name, size and sha256. A cached archive is reused only if its checksum
+still matches, so rebuilds need no network at all (-offline forbids it).
+
+The CSV is never unpacked to disk by this module's readers: open_raw streams
+it out of the .zip / .tar.gz (or reads a plain .csv), which is what
+ingestResults.py uses. extract_raw writes it once, for buildRefinedResults.R,
+the only reader of the raw CSV that still needs it on disk.
+
+Usage: python3 archiveCache.py <year> [-cache cache] [-offline]   (prints the archive path)
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tarfile
+import time
+import urllib.request
+import zipfile
+
+RAW = 'raw-result-analysis.csv'
+ARCHIVES = [RAW + '.zip', RAW + '.tar.gz']
+MCC_URL = 'https://mcc.lip6.fr/{year}/archives/{name}'
+# the server answers a missing archive with a small HTML page
+MIN_ARCHIVE_SIZE = 10000
+
+
+def sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_manifest(folder):
+    try:
+        with open(os.path.join(folder, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cached_archive(folder):
+    """Path of the archive of a year folder, or None if it is missing or corrupted."""
+    manifest = read_manifest(folder)
+    if manifest is None:
+        return None
+    path = os.path.join(folder, manifest['name'])
+    if not os.path.exists(path) or os.path.getsize(path) != manifest['size'] or sha256(path) != manifest['sha256']:
+        return None
+    return path
+
+
+def fetch(url, path):
+    try:
+        with urllib.request.urlopen(url) as response, open(path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+    except BaseException:
+        # no partial download left behind (connection reset, disk full, interrupted)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        raise
+
+
+def download(year, folder):
+    """Download the year's archive into folder and record its checksum."""
+    os.makedirs(folder, exist_ok=True)
+    for name in ARCHIVES:
+        url = MCC_URL.format(year=year, name=name)
+        tmp = os.path.join(folder, name + '.part')
+        try:
+            fetch(url, tmp)
+        except OSError:
+            continue
+        if os.path.getsize(tmp) > MIN_ARCHIVE_SIZE:
+            path = os.path.join(folder, name)
+            os.replace(tmp, path)
+            manifest = {'year': year, 'name': name, 'url': url,
+                        'size': os.path.getsize(path), 'sha256': sha256(path)}
+            with open(os.path.join(folder, 'manifest.json.tmp'), 'w') as f:
+                json.dump(manifest, f, indent=1)
+            os.replace(os.path.join(folder, 'manifest.json.tmp'), os.path.join(folder, 'manifest.json'))
+            return path
+        os.remove(tmp)
+    raise OSError(f"no {RAW} archive found for {year} at {MCC_URL.format(year=year, name='')}")
+
+
+def get_archive(year, cache='cache', offline=False):
+    """Path of the year's archive, downloaded only if it is not validly cached."""
+    folder = os.path.join(cache, str(year))
+    path = cached_archive(folder)
+    if path is not None:
+        return path
+    if offline:
+        raise OSError(f"{folder}: no valid cached archive for {year}, and -offline forbids downloading it")
+    return download(year, folder)
+
+
+def archive_path(path):
+    """A year folder of the cache stands for the archive it holds."""
+    if os.path.isdir(path):
+        archive = cached_archive(path)
+        if archive is None:
+            raise OSError(f"{path}: no valid cached archive")
+        return archive
+    return path
+
+
+@contextlib.contextmanager
+def open_raw(path, member=RAW):
+    """Binary stream of the CSV in a .zip, a .tar.gz, a cache folder, or a plain file."""
+    path = archive_path(path)
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as z, z.open(member) as f:
+            yield f
+    elif path.endswith(('.tar.gz', '.tgz')):
+        with tarfile.open(path, 'r:gz') as t:
+            f = t.extractfile(member)
+            if f is None:
+                raise OSError(f"{path}: {member} is not a file")
+            yield f
+    else:
+        with open(path, 'rb') as f:
+            yield f
+
+
+def extract_raw(source, dest):
+    """Write the CSV of an archive to dest (replaced atomically)."""
+    with open_raw(source) as f, open(dest + '.tmp', 'wb') as out:
+        shutil.copyfileobj(f, out, 1 << 20)
+    os.replace(dest + '.tmp', dest)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Download (once) and print the path of a year's raw-result-analysis archive.")
+    ap.add_argument('year', type=int)
+    ap.add_argument('-cache', default='cache', help="cache folder (default cache)")
+    ap.add_argument('-offline', action='store_true', help="fail instead of downloading a missing archive")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    try:
+        path = get_archive(args.year, args.cache, args.offline)
+    except OSError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+    sys.stderr.write(f"Processed {args.year} in {time.time() - start_time:.2f} seconds.\n")
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
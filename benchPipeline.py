@@ -0,0 +1,155 @@
+"""Scale benchmark of the analysis pipeline on synthetic years.
+
+For each -scale, synthResults.py writes -years synthetic raw-result-analysis.csv
+(and the ModelDescriptions.csv of their models) into a scratch website folder,
+then the pipeline's own scripts run on it, as the runPipeline.py stages do:
+
+    <year>/ingest       ingestResults.py -store refined -models models.csv
+    <year>/categories   buildCategories.py -store refined -scores (resolution, tool indexes, scores)
+    <year>/venn         buildVennCounts.py
+    <year>/jvenn        buildJVennPages.py (filters.json and the Venn pages)
+    <year>/html         buildHTMLFromCSV.py -json 5000
+    models/hardness     analyzeHardness.py (cross-year)
+    site/annual         analyzeAnnual.R (cross-year, when Rscript is available)
+
+Each stage is one process: its wall time, CPU time and peak resident memory
+(from wait4) are recorded. The results are written as JSON (-o), to keep as a
+baseline; -compare prints the ratios of this run to such a baseline.
+
+Usage: python3 benchPipeline.py [-scale 1,10] [-years 2] [-tools 12] [-formulas 16]
+                                [-work bench] [-o bench/results.json] [-compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+
+from runPipeline import JSON_ROWS, copy_templates, python, repo, rscript
+from runReport import run_measured
+from synthResults import BASE_MODELS, BASE_TOOLS, FORMULAS, model_names, tool_names, write_descriptions, write_raw
+
+RESULTS_VERSION = 1
+FIRST_YEAR = 2025
+
+
+def run_stage(name, command, cwd, logs):
+    """Run one stage process; its wall time, CPU time and peak RSS."""
+    with open(os.path.join(logs, name.replace('/', '_') + '.log'), 'w') as log:
+        log.write(f"+ {' '.join(command)}\n")
+        log.flush()
+        status, elapsed, cpu, peak = run_measured(command, cwd, log)
+    record = {'name': name, 'seconds': round(elapsed, 3), 'cpu': round(cpu, 3), 'peak_mb': peak,
+              'status': 'ok' if status == 0 else 'failed'}
+    print(f"{'[done]' if record['status'] == 'ok' else '[FAILED]'} {name} in {elapsed:.2f} seconds, "
+          f"peak {record['peak_mb']} MB.", flush=True)
+    return record
+
+
+def stages(years, nupn):
+    """(name, command, cwd) of the benchmarked stages, cwd relative to the website folder."""
+    result = []
+    for year in years:
+        y = str(year)
+        result += [
+            (f'{y}/ingest', python('ingestResults.py', 'raw-result-analysis.csv', '-store', 'refined',
+                                   '-models', 'models.csv'), y),
+            (f'{y}/categories', python('buildCategories.py', '-store', 'refined', '-scores', '-nupn', nupn), y),
+            (f'{y}/venn', python('buildVennCounts.py'), y),
+            (f'{y}/jvenn', python('buildJVennPages.py'), y),
+            (f'{y}/html', python('buildHTMLFromCSV.py', '-json', str(JSON_ROWS), '.'), y),
+        ]
+    result.append(('models/hardness', python('analyzeHardness.py', '-j', '0'), 'models'))
+    if shutil.which('Rscript'):
+        result.append(('site/annual', rscript('analyzeAnnual.R'), '.'))
+    return result
+
+
+def bench_scale(scale, args):
+    """Generate the synthetic years of one scale and time every stage on them."""
+    models = model_names(max(1, round(BASE_MODELS * scale)))
+    tools = tool_names(args.tools)
+    years = list(range(FIRST_YEAR, FIRST_YEAR + args.years))
+    root = os.path.abspath(os.path.join(args.work, f'scale{scale:g}'))
+    logs = os.path.join(root, 'logs')
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(os.path.join(root, 'models'))
+    os.makedirs(os.path.join(root, 'csv'))
+    os.makedirs(logs)
+
+    start_time = time.time()
+    raw_rows = 0
+    for year in years:
+        os.makedirs(os.path.join(root, str(year)))
+        # buildJVennPages.py renders from the year's copy of the templates, as in the pipeline
+        copy_templates(os.path.join(root, str(year)))
+        raw_rows += write_raw(os.path.join(root, str(year), 'raw-result-analysis.csv'), models, tools,
+                              args.formulas, seed=year)
+    write_descriptions(os.path.join(root, 'models', 'ModelDescriptions.csv'), models)
+    print(f"Generated {len(years)} years of {len(models)} models, {raw_rows} rows "
+          f"in {time.time() - start_time:.2f} seconds.", flush=True)
+
+    records = []
+    for name, command, cwd in stages(years, repo('nupn', 'nupn.csv')):
+        records.append(run_stage(name, command, os.path.join(root, cwd), logs))
+    if not args.keep:
+        shutil.rmtree(root, ignore_errors=True)
+    return {'scale': scale, 'models': len(models), 'tools': args.tools, 'formulas': args.formulas,
+            'years': len(years), 'raw_rows': raw_rows, 'stages': records}
+
+
+def compare(results, baseline):
+    """Print time and memory ratios of the runs to the baseline runs of the same scale."""
+    base_runs = {run['scale']: run for run in baseline['runs']}
+    for run in results['runs']:
+        base = base_runs.get(run['scale'])
+        if base is None:
+            print(f"scale {run['scale']:g}: not in the baseline")
+            continue
+        print(f"scale {run['scale']:g} ({run['models']} models, baseline {base['models']}):")
+        base_stages = {stage['name']: stage for stage in base['stages']}
+        for stage in run['stages']:
+            old = base_stages.get(stage['name'])
+            if old is None or old['status'] != 'ok' or stage['status'] != 'ok':
+                print(f"  {stage['name']:<18} {stage['status']} (baseline: {old['status'] if old else 'absent'})")
+                continue
+            print(f"  {stage['name']:<18} {old['seconds']:>8.2f} -> {stage['seconds']:>8.2f} s "
+                  f"(x{stage['seconds'] / max(old['seconds'], 1e-3):.2f})  "
+                  f"{old['peak_mb']:>8.1f} -> {stage['peak_mb']:>8.1f} MB "
+                  f"(x{stage['peak_mb'] / max(old['peak_mb'], 1e-3):.2f})")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time the pipeline stages on synthetic years of growing size.")
+    ap.add_argument('-scale', default='1', help="comma separated sizes, in multiples of a 2025 year (default 1)")
+    ap.add_argument('-years', type=int, default=2, help="synthetic years per scale, for the cross-year stages (default 2)")
+    ap.add_argument('-tools', type=int, default=BASE_TOOLS, help=f"tools per year (default {BASE_TOOLS})")
+    ap.add_argument('-formulas', type=int, default=FORMULAS, help=f"formulas per examination (default {FORMULAS})")
+    ap.add_argument('-work', default='bench', help="scratch folder of the synthetic websites (default bench)")
+    ap.add_argument('-keep', action='store_true', help="keep the synthetic websites after the run")
+    ap.add_argument('-o', default=os.path.join('bench', 'results.json'), help="results file (default bench/results.json)")
+    ap.add_argument('-compare', help="results file of a previous run to compare with")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    results = {'version': RESULTS_VERSION, 'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'host': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+               'runs': [bench_scale(float(scale), args) for scale in args.scale.split(',')]}
+    os.makedirs(os.path.dirname(os.path.abspath(args.o)), exist_ok=True)
+    with open(args.o, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"Processed {len(results['runs'])} scales in {time.time() - start_time:.2f} seconds, results in {args.o}.")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    failed = [stage['name'] for run in results['runs'] for stage in run['stages'] if stage['status'] != 'ok']
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Per-category resolution.csv and tool_index_dict.json (and its packed copy, see
+toolIndex.py) from the refined long table; with -scores, also each category's
+scores.csv and the year's answers.csv.
+
+Python port of the category loops of buildRefinedResults.R: number the queries
+that got a correct ("T") answer, record for each tool the Index of its answers
+and errors, add the Solutions hardness metric computed on the bitset
+tool x query matrix of toolMatrix.py, and (-scores) count the answers and errors
+of each tool next to those of the Ideal Tool. The scores are opt-in: they have
+not been compared with the output of buildRefinedResults.R on a real year yet,
+so the pipeline still takes scores.csv and answers.csv from the R script.
+
+With -iscex / -nupn, the resolutions get their FormulaType and Nupn columns
+(see queryAnnotations.py) before they are written, instead of being rewritten
+by a second pass.
+
+The long table comes from ingestResults.py (raw CSV) or from a resultStore.py
+directory. Category folders are written in the current directory.
+
+With -chunk ROWS, the raw CSV is read ROWS lines at a time and each category
+accumulates only what its outputs need (see categoryStream.py), instead of
+holding the whole long table: for years too large to explode in memory. Its
+memory still grows with the number of distinct queries of the year. It is
+opt-in (the pipeline reads the store); the raw CSV is read twice, the first time
+for the width of the masks.
+
+Usage: python3 buildCategories.py [raw-result-analysis.csv[.zip|.tar.gz] [-chunk ROWS] | -store refined [-models models.csv]]
+                                  [-scores] [-iscex iscex.csv] [-nupn nupn.csv]
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingestResults import MODEL_COLUMNS, write_csv_r
+from queryAnnotations import Annotations, write_annotated
+from runReport import record
+from toolIndex import write_packed
+from toolMatrix import ToolQueryMatrix, tool_family_dict
+
+# Define categories
+CATEGORIES = {
+    "state_space": ["StateSpace"],
+    "global_properties": ["Liveness", "QuasiLiveness", "StableMarking", "ReachabilityDeadlock", "OneSafe"],
+    "reachability": ["ReachabilityCardinality", "ReachabilityFireability"],
+    "ctl": ["CTLCardinality", "CTLFireability"],
+    "ltl": ["LTLCardinality", "LTLFireability"],
+    "upper_bounds": ["UpperBounds"]
+}
+
+QUERY_COLUMNS = MODEL_COLUMNS + ['Examination', 'ID']
+
+# Ideal Tool answers of an examination, per model
+IDEAL_FACTORS = {
+    "StateSpace": 4,
+    "Liveness": 1, "QuasiLiveness": 1, "StableMarking": 1, "ReachabilityDeadlock": 1, "OneSafe": 1,
+    "ReachabilityCardinality": 16, "ReachabilityFireability": 16, "CTLCardinality": 16, "CTLFireability": 16,
+    "LTLCardinality": 16, "LTLFireability": 16, "UpperBounds": 16
+}
+
+
+def build_resolution(df_category):
+    """Number the distinct (query, Result) pairs answered "T"; return them with
+    the (Tool, Index, Verdict) rows of the category."""
+    query = df_category.groupby(QUERY_COLUMNS, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+    solved = (df_category['Verdict'] == 'T').to_numpy()
+    first = pd.DataFrame({'query': query[solved], 'Result': df_category['Result'].to_numpy()[solved]})
+    first = first.drop_duplicates().index.to_numpy()
+    rows = np.flatnonzero(solved)[first]
+
+    resolution = df_category.iloc[rows][QUERY_COLUMNS + ['Result']].rename(columns={'Result': 'Consensus'})
+    resolution = resolution.reset_index(drop=True)
+    resolution.insert(0, 'Index', np.arange(1, len(resolution) + 1))
+
+    # left join on the query, keeping the row order; several Consensus for one
+    # query duplicate the tool rows, as the R left_join does
+    index = pd.DataFrame({'query': query[rows], 'Index': resolution['Index']})
+    joined = pd.DataFrame({'query': query, 'Tool': df_category['Tool'].to_numpy(),
+                           'Verdict': df_category['Verdict'].to_numpy()})
+    joined = joined.merge(index, on='query', how='left', sort=False)
+    return resolution, joined[['Tool', 'Index', 'Verdict']]
+
+
+def build_tool_index(tool_rows):
+    """Sorted answer ("T") and error ("X") Index of each tool, in order of appearance."""
+    tools = pd.unique(tool_rows['Tool'].astype(object))
+    tool_index = {tool: {'answers': [], 'errors': []} for tool in tools}
+    for verdict, field in (('T', 'answers'), ('X', 'errors')):
+        rows = tool_rows[(tool_rows['Verdict'] == verdict) & tool_rows['Index'].notna()]
+        rows = rows.assign(Tool=rows['Tool'].astype(object), Index=rows['Index'].astype(np.int64))
+        for tool, indices in rows.groupby('Tool', sort=False)['Index']:
+            tool_index[tool][field] = np.sort(indices.to_numpy())
+    return tool_index
+
+
+def write_tool_index(tool_index, path):
+    """Same JSON as jsonlite::write_json of the R list: Index values as strings."""
+    data = {tool: {field: np.asarray(indices, dtype=np.int64).astype(str).tolist() for field, indices in entry.items()}
+            for tool, entry in tool_index.items()}
+    with open(path, 'w') as f:
+        # an empty named list is written as [] by jsonlite
+        f.write(json.dumps(data if data else [], separators=(',', ':')))
+
+
+def build_scores(df_category, num_models):
+    """Answers and errors of each tool, in total and per examination, and the Ideal Tool row."""
+    frame = pd.DataFrame({'Tool': df_category['Tool'].astype(object).to_numpy(),
+                          'Examination': df_category['Examination'].astype(object).to_numpy(),
+                          'answer': (df_category['Verdict'] == 'T').to_numpy(),
+                          'error': (df_category['Verdict'] == 'X').to_numpy()})
+    per_exam = frame.groupby(['Tool', 'Examination'])[['answer', 'error']].sum()
+    return scores_table(per_exam, pd.unique(frame['Examination']), num_models)
+
+
+def scores_table(per_exam, examinations, num_models):
+    """scores.csv from the answer and error counts per (Tool, Examination), sorted, and the
+    examinations in order of appearance."""
+    total = per_exam.groupby(level='Tool').sum()
+
+    # pivot_wider: examinations in order of appearance in the (Tool, Examination) groups
+    columns = pd.unique(per_exam.index.get_level_values('Examination'))
+    scores = pd.DataFrame({'Tool': total.index, 'answer_total': total['answer'].to_numpy(),
+                           'error_total': total['error'].to_numpy()})
+    for exam in columns:
+        for field in ('answer', 'error'):
+            scores[f'{field}_{exam}'] = per_exam[field].xs(exam, level='Examination').reindex(total.index).to_numpy()
+
+    # the ideal values follow the order of appearance of the examinations in the data,
+    # and are bound to the columns by position, as rbind does in R
+    ideal = [num_models * IDEAL_FACTORS[exam] if exam in IDEAL_FACTORS else np.nan for exam in examinations]
+    row = ['Ideal Tool', np.sum(ideal), 0] + [value for answer in ideal for value in (answer, 0)]
+    scores.loc[len(scores)] = row
+    for column in scores.columns[1:]:
+        scores[column] = scores[column].astype('Int64')
+    return scores
+
+
+def build_answers(scores):
+    """The per-examination columns of every category's scores, full joined on the Tool, NA as 0."""
+    answers = None
+    for category_scores in scores:
+        category_scores = category_scores.drop(columns=['answer_total', 'error_total']).set_index('Tool')
+        if answers is None:
+            answers = category_scores
+        else:
+            # full_join keeps the rows of the left side, then adds the new tools of the right side
+            tools = answers.index.append(category_scores.index[~category_scores.index.isin(answers.index)])
+            answers = answers.reindex(tools).join(category_scores)
+    return answers.fillna(0).astype('int64').reset_index()
+
+
+def process_category(long, category_name, examinations, num_models=None, annotations=None):
+    df_category = long[long['Examination'].isin(examinations)]
+    resolution, tool_rows = build_resolution(df_category)
+    tool_index = build_tool_index(tool_rows)
+    resolution = write_category(category_name, resolution, tool_index, annotations)
+
+    scores = None
+    if num_models is not None:
+        scores = build_scores(df_category, num_models)
+        write_csv_r(scores, os.path.join(category_name, "scores.csv"))
+    return resolution, tool_index, scores
+
+
+def write_category(category_name, resolution, tool_index, annotations=None):
+    """Complete the resolution (Solutions, ID, annotations) and write it with the tool indexes."""
+    # Add the hardness metric to the resolution data frame
+    matrix = ToolQueryMatrix({tool: entry['answers'] for tool, entry in tool_index.items()}, len(resolution))
+    resolution['Solutions'] = matrix.solutions(tool_family_dict(tool_index))
+
+    # Decrease 'ID' by 1 and pad it with leading zeros
+    resolution['ID'] = (resolution['ID'].astype(np.int64) - 1).astype(str).str.zfill(2)
+
+    os.makedirs(category_name, exist_ok=True)
+    if annotations is None:
+        write_csv_r(resolution, os.path.join(category_name, "resolution.csv"))
+    else:
+        # FormulaType and Nupn joined in memory: the file is written once, already annotated
+        resolution = annotations.annotate(resolution)
+        write_annotated(resolution, os.path.join(category_name, "resolution.csv"))
+    write_tool_index(tool_index, os.path.join(category_name, "tool_index_dict.json"))
+    write_packed(tool_index, os.path.join(category_name, "tool_index_packed.json"))
+    return resolution
+
+
+def load_long(args):
+    """The long table, and the models table (None if -scores does not need it from a store)."""
+    if args.store:
+        from resultStore import load_store
+        models = pd.read_csv(args.models) if args.scores else None
+        return load_store(args.store), models
+    from ingestResults import refine
+    long, models = refine(args.input)
+    write_csv_r(models, args.models)
+    return long, models
+
+
+def process_chunked(args, annotations):
+    """The category outputs and answers.csv from the raw CSV, read args.chunk rows at a time."""
+    from categoryStream import stream_categories
+    start_time = time.time()
+    streams, model_values, models = stream_categories(args.input, CATEGORIES, args.chunk)
+    write_csv_r(models, args.models)
+    print(f"Read {args.input} in chunks of {args.chunk} rows in {time.time() - start_time:.2f} seconds.")
+
+    scores = []
+    for category_name, stream in streams.items():
+        start_time = time.time()
+        tool_index = stream.tool_index()
+        resolution = write_category(category_name, stream.resolution(model_values), tool_index, annotations)
+        if args.scores:
+            category_scores = scores_table(stream.per_exam(), stream.examinations, len(models))
+            write_csv_r(category_scores, os.path.join(category_name, "scores.csv"))
+            scores.append(category_scores)
+        elapsed_time = time.time() - start_time
+        print(f"Processed {category_name}: {len(resolution)} queries, {len(tool_index)} tools in {elapsed_time:.2f} seconds.")
+        record(category_name, category=category_name, rows_out=len(resolution), tools=len(tool_index), seconds=elapsed_time)
+    if args.scores:
+        write_csv_r(build_answers(scores), "answers.csv")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write <category>/resolution.csv and tool_index_dict.json (and scores.csv, answers.csv).")
+    ap.add_argument('input', nargs='?', default='raw-result-analysis.csv')
+    ap.add_argument('-store', help="read the long table from a resultStore.py directory")
+    ap.add_argument('-models', default='models.csv', help="models of the year: written from the raw CSV, read with -store -scores")
+    ap.add_argument('-scores', action='store_true', help="also write scores.csv and answers.csv (not yet checked against buildRefinedResults.R)")
+    ap.add_argument('-iscex', help="annotate the resolutions with the FormulaType of these formulas")
+    ap.add_argument('-nupn', help="annotate the resolutions with the NUPN flags of these models")
+    ap.add_argument('-chunk', type=int, help="read the raw CSV this many rows at a time (less memory on large years)")
+    args = ap.parse_args()
+    if args.chunk is not None and (args.store or args.chunk < 1):
+        ap.error("-chunk needs a positive number of rows and the raw CSV, not -store")
+
+    annotations = Annotations(args.iscex, args.nupn) if args.iscex or args.nupn else None
+    if args.chunk:
+        process_chunked(args, annotations)
+        return
+
+    long, models = load_long(args)
+    num_models = len(models) if args.scores else None
+    scores = []
+    for category_name, examinations in CATEGORIES.items():
+        start_time = time.time()
+        resolution, tool_index, category_scores = process_category(long, category_name, examinations, num_models, annotations)
+        scores.append(category_scores)
+        elapsed_time = time.time() - start_time
+        print(f"Processed {category_name}: {len(resolution)} queries, {len(tool_index)} tools in {elapsed_time:.2f} seconds.")
+        record(category_name, category=category_name, rows_out=len(resolution), tools=len(tool_index), seconds=elapsed_time)
+
+    if num_models is not None:
+        write_csv_r(build_answers(scores), "answers.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,6 @@ from jinja2 import Environment, FileSystemLoader
 from natsort import natsorted
 import shutil
 
-# Configure Jinja2 environment
-env = Environment(loader=FileSystemLoader("templates"))
 # Define the categories and their corresponding files
 categories = {
     "State_Space": "state_space",
@@ -16,21 +14,26 @@ categories = {
     "Upper_Bounds": "upper_bounds"
 }
 
-# Create the index.html file
-index_template = env.get_template("index.html")
-with open("index.html", "w") as index_file:
-    index_file.write(index_template.render(categories=categories))
+def build(env, folder='.'):
+    # Create the index.html file
+    index_template = env.get_template("index.html")
+    with open(os.path.join(folder, "index.html"), "w") as index_file:
+        index_file.write(index_template.render(categories=categories))
 
-# Create a page for each category
-category_template = env.get_template("category.html")
-for category_name, category_file in categories.items():
-    table_html = Path(f"{category_file}/scores.html").read_text()
-    
-    with open(f"{category_file}/index.html", "w") as category_file:
-        category_file.write(category_template.render(
-            category_name=category_name.replace("_", " "),
-            table_html=table_html,
-            category_file=categories[category_name]
-        ))
+    # Create a page for each category
+    category_template = env.get_template("category.html")
+    for category_name, category_file in categories.items():
+        table_html = Path(folder, category_file, "scores.html").read_text()
 
-shutil.copy("templates/styles.css", "./styles.css")
\ No newline at end of file
+        with open(os.path.join(folder, category_file, "index.html"), "w") as out_file:
+            out_file.write(category_template.render(
+                category_name=category_name.replace("_", " "),
+                table_html=table_html,
+                category_file=category_file
+            ))
+
+    shutil.copy(os.path.join(folder, "templates", "styles.css"), os.path.join(folder, "styles.css"))
+
+if __name__ == "__main__":
+    # Configure Jinja2 environment
+    build(Environment(loader=FileSystemLoader("templates")))
@@ -1,11 +1,30 @@
-import pandas as pd
+"""DataTables page <name>.html for every <name>.csv of the given folders.
+
+Tables of more than -json ROWS rows are written as JSON shards in
+<name>_data/, next to a small page loading them with DataTables' ajax and
+deferRender options: rows are drawn a page at a time, as the shards arrive.
+
+All folders are processed in one interpreter; a year folder stands for its
+category folders, and -j spreads the folders over several processes.
+
+Usage: python3 buildHTMLFromCSV.py [folder ...] [-json ROWS] [-shard ROWS] [-j N]
+"""
+import argparse
+import csv
 import glob
+import json
+import os
 import time
+from functools import partial
+from itertools import chain, islice
 
-def custom_html_table(df):
+from htmlTable import SHARD_ROWS, expand_folders, run_all, write_json_shards, write_table
+from runReport import record
+
+def column_classes(columns):
     classes = []
-    for col in df.columns:
-        if col == df.columns[0]:
+    for col in columns:
+        if col == columns[0]:
             classes.append("tool")
         elif col.endswith("error_total"):
             classes.append("total errors")
@@ -15,24 +34,9 @@ def custom_html_table(df):
             classes.append("details errors")
         else:
             classes.append("details")
+    return classes
 
-    table_html = '<table id="myTable" class="display dataTables_wrapper">'
-    header = '<thead><tr>'
-    for i, col in enumerate(df.columns):
-        header += f'<th class="{classes[i]}">{col}</th>'
-    header += '</tr></thead>'
-    table_html += header
-
-    table_html += df.to_html(header=False, index=False, classes="display", justify="left", escape=False, table_id=None)
-    table_html = table_html.replace('<table border="1" class="dataframe display">', '')
-    table_html = table_html.replace('</table>', '')
-    table_html += '</table>'
-    return table_html
-
-def generate_html(df, output_filename):
-    html_table = custom_html_table(df)
-
-    html = f"""
+PAGE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -44,65 +48,133 @@ def generate_html(df, output_filename):
       <label><input type="checkbox" id="detailsToggle" checked> Show details</label>
       <label><input type="checkbox" id="errorsToggle"> Show errors</label>
       {html_table}
+      {loader}
       <script>
-        $(document).ready(function() {{
+        $(document).ready(function() {
           let detailsVisible = true;
           let errorsVisible = false;
-          let table = $('#myTable').DataTable({{
-            "paging": false,
-            "order": [[1, "desc"]]
-          }});
+          let table = $('#myTable').DataTable({
+            {table_options}
+          });
 
-          function updateVisibility() {{
+          function updateVisibility() {
             table.columns('.details:not(.errors)').visible(detailsVisible);
             table.columns('.details.errors').visible(detailsVisible && errorsVisible);
             table.columns('.total.errors').visible(errorsVisible);
-          }}
+          }
 
           updateVisibility();
 
-          $('#detailsToggle').on('change', function() {{
+          $('#detailsToggle').on('change', function() {
             detailsVisible = this.checked;
             updateVisibility();
-          }});
+          });
 
-          $('#errorsToggle').on('change', function() {{
+          $('#errorsToggle').on('change', function() {
             errorsVisible = this.checked;
             updateVisibility();
-          }});
-        }});
+          });
+        });
       </script>
 
     </body>
     </html>
     """
 
+INLINE_OPTIONS = """"paging": false,
+            "order": [[1, "desc"]]"""
+
+SHARDED_OPTIONS = """"deferRender": true,
+            "pageLength": 100,
+            "order": [[1, "desc"]],
+            "ajax": loadShards"""
+
+# shards are column oriented, possibly dictionary encoded (see htmlTable.py)
+LOADER = """<script>
+        const shards = {shards};
+        function decodeShard(shard) {
+          const columns = shard.columns.map(c => Array.isArray(c) ? c : c.codes.map(i => c.values[i]));
+          const rows = new Array(shard.rows);
+          for (let r = 0; r < shard.rows; r++) {
+            rows[r] = columns.map(c => c[r]);
+          }
+          return rows;
+        }
+        function loadShards(data, callback, settings) {
+          if (shards.length == 0) {
+            callback({data: []});
+            return;
+          }
+          $.getJSON(shards[0]).then(function(shard) {
+            callback({data: decodeShard(shard)});
+            let api = new $.fn.dataTable.Api(settings);
+            let next = $.when();
+            shards.slice(1).forEach(function(url) {
+              next = next.then(() => $.getJSON(url)).then(function(shard) {
+                api.rows.add(decodeShard(shard)).draw(false);
+              });
+            });
+          });
+        }
+      </script>"""
+
+TABLE_ATTRIBUTES = ' id="myTable" class="display dataTables_wrapper"'
+
+def write_page(output_filename, header, rows, loader='', options=INLINE_OPTIONS):
+    page = PAGE.replace("{loader}", loader).replace("{table_options}", options)
+    head, tail = page.split("{html_table}")
     with open(output_filename, 'w') as f:
-        f.write(html)
-
-# Find all CSV files in the current folder
-csv_files = glob.glob('*.csv')
-
-for csv_file in csv_files:
-    if csv_file == 'raw-result-analysis.csv':
-        continue  # Skip this file and move on to the next one
-
-    if csv_file == 'refined-result-bvt.csv':
-        continue  # Skip this file and move on to the next one
-
-    if csv_file == 'models.csv':
-        continue  # Skip this file and move on to the next one
-
-
-    start_time = time.time()  # Record the start time for processing the current file
-
-    # Load the CSV file into a pandas dataframe
-    df = pd.read_csv(csv_file)
-
-    # Generate the HTML table for the current CSV file
-    output_filename = csv_file.replace('.csv', '.html')
-    generate_html(df, output_filename)
-
-    elapsed_time = time.time() - start_time  # Calculate the elapsed time for processing the current file
-    print(f"Processed {csv_file} in {elapsed_time:.2f} seconds.")  # Print the elapsed time for processing the current file
-
+        f.write(head)
+        write_table(f, header, rows, attributes=TABLE_ATTRIBUTES, classes=column_classes(header), sections=True)
+        f.write(tail)
+
+def generate_html(csv_file, output_filename, json_rows=None, shard_rows=SHARD_ROWS):
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if json_rows is None:
+            write_page(output_filename, header, reader)
+            return
+        first = list(islice(reader, json_rows + 1))
+        if len(first) <= json_rows:
+            write_page(output_filename, header, first)
+            return
+        # the page only holds the header, the rows are in the shards
+        folder = os.path.splitext(output_filename)[0] + '_data'
+        names = write_json_shards(chain(first, reader), folder, shard_rows)
+        shards = json.dumps([f'{os.path.basename(folder)}/{name}' for name in names])
+        write_page(output_filename, header, [], LOADER.replace("{shards}", shards), SHARDED_OPTIONS)
+
+SKIPPED = ['raw-result-analysis.csv', 'refined-result-bvt.csv', 'models.csv']
+
+def process_folder(folder, json_rows=None, shard_rows=SHARD_ROWS):
+    # Find all CSV files in the folder
+    csv_files = glob.glob(os.path.join(folder, '*.csv'))
+
+    for csv_file in csv_files:
+        if os.path.basename(csv_file) in SKIPPED:
+            continue  # Skip the raw and refined results, and the model list
+
+        start_time = time.time()  # Record the start time for processing the current file
+
+        # Stream the CSV file into the HTML table, or its JSON shards
+        output_filename = csv_file[:-len('.csv')] + '.html'
+        generate_html(csv_file, output_filename, json_rows, shard_rows)
+
+        elapsed_time = time.time() - start_time  # Calculate the elapsed time for processing the current file
+        print(f"Processed {csv_file} in {elapsed_time:.2f} seconds.", flush=True)  # Print the elapsed time for processing the current file
+        record(csv_file, category=os.path.basename(os.path.abspath(folder)), seconds=elapsed_time)
+
+def main():
+    ap = argparse.ArgumentParser(description="Build a DataTables page for each CSV file of the given folders.")
+    ap.add_argument('folders', nargs='*', default=['.'],
+                    help="category folders, or year / website folders standing for all their categories (default: current folder)")
+    ap.add_argument('-json', type=int, metavar='ROWS', help="write tables of more than ROWS rows as JSON shards")
+    ap.add_argument('-shard', type=int, default=SHARD_ROWS, metavar='ROWS', help=f"rows per JSON shard (default {SHARD_ROWS})")
+    ap.add_argument('-j', type=int, default=1, help="process folders on N cores (0 = all cores)")
+    args = ap.parse_args()
+
+    run_all(partial(process_folder, json_rows=args.json, shard_rows=args.shard), expand_folders(args.folders), args.j)
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,120 @@
+import json
+import os
+import re
+import shutil
 import pandas as pd
-import numpy as np
 from jinja2 import Environment, FileSystemLoader
 
-# Load original CSV file
-df = pd.read_csv("ModelHardness.csv")
-
 # Define ideal scores
 ideal_scores = {'ctl': 32, 'global_properties': 5, 'ltl': 32, 'reachability': 32, 'state_space': 4, 'upper_bounds': 16}
 
-# List all examination categories and years
+# List all examination categories
 categories = ['ctl', 'global_properties', 'ltl', 'reachability', 'state_space', 'upper_bounds']
-# Data only exists from 2018 onward (the pipeline builds year dirs > 2017).
-years = list(range(2018, 2027))
-
-# Create a new column 'ModelKey' as a concatenation of 'ModelFamily' and 'ModelType'
-df['ModelKey'] = df['ModelFamily'] + "_" + df['ModelType']
-
-# Initialize list to store data frames, one for each category
-dfs = []
-csv_files = []
-# Initialize dictionary to store lowest scoring models of latest
-hardest_models_latest = {}
-
-# For each category, create a data frame with columns 'Year', 'ModelKey', 'Score', 'NormalizedScore'
-for category in categories:
-    # Initialize lists to store column data
-    years_list = []
-    model_keys_list = []
-    scores_list = []
-    normalized_scores_list = []
-    hardness_scores_list = []
-    
-    # For each year, extract scores for this category
-    for year in years:
-        # Group by 'ModelKey' and calculate average score for this category in this year
-        df_year = df.groupby('ModelKey')[f'{category}BVT{year}'].mean().reset_index()
-        # New df for hardness scores
-        df_hardness = df.groupby('ModelKey')[f'{category}SOL{year}'].mean().reset_index()  
-        # Add this year to years_list
-        years_list.extend([year]*len(df_year))
-        # Add model keys to model_keys_list
-        model_keys_list.extend(df_year['ModelKey'])
-        # Add average scores to scores_list
-        scores = df_year[f'{category}BVT{year}']
-        scores_list.extend(scores)
-        # Add hardness scores to hardness_scores_list
-        hardness_scores = df_hardness[f'{category}SOL{year}']
-        hardness_scores_list.extend(hardness_scores)
-        # Add normalized scores to normalized_scores_list
-        normalized_scores_list.extend(scores / ideal_scores[category])
-        # If year is latest, update hardest_models_latest dictionary
-        if year == 2026:
-            for key, score in df_year.values:
-                if key not in hardest_models_latest or score < hardest_models_latest[key]:
-                    hardest_models_latest[key] = score
-    
-    # Create data frame for this category
-    df_category = pd.DataFrame({
-        'Year': years_list,
-        'ModelKey': model_keys_list,
-        'Score': scores_list,
-        'NormalizedScore': normalized_scores_list,
-        'HardnessScore': hardness_scores_list
-    })
-    # Drop rows with missing score
-    df_category = df_category.dropna(subset=['Score'])
-    # Add data frame to list
-    dfs.append(df_category)
-
-    # Save the corresponding data frame to a CSV file and append the filename to csv_files
-    filename = f"{category}.csv"
-    df_category.to_csv(filename, index=False)
-    csv_files.append(filename)
-
-# Compute the ten "hardest" models (those with the lowest average score in latest over all categories)
-ten_hardest_models = sorted(hardest_models_latest, key=hardest_models_latest.get)[:10]
-
-# Set up Jinja2 template environment
-env = Environment(loader=FileSystemLoader("templates"))
-
-# Load the template
-template = env.get_template('hardness_plot.html')
-
-# Render the template
-rendered_template = template.render(csv_files=csv_files, initial_model_keys=ten_hardest_models)
-
-# Write the rendered template to a file
-with open('hardness_plot_rendered.html', 'w') as f:
-    f.write(rendered_template)
+
+# <category>BVT<year> and <category>SOL<year> columns of ModelHardness.csv (see analyzeHardness.py)
+SCORE_COLUMN = re.compile(r'^(?P<Category>[a-z_]+)(?P<Metric>BVT|SOL)(?P<Year>\d{4})$')
+
+# Long format output, one row per (category, year, model) with a score
+CUBE_FILE = 'hardness_scores.csv'
+
+# Per model JSON shards loaded on demand by the page, and their index
+DATA_FOLDER = 'hardness_data'
+
+# Largest choice of the "hardest in year" selector of the page
+HARDEST = 20
+
+def hardness_cube(df):
+    """(Category, Year, ModelKey) -> Score, NormalizedScore, HardnessScore: per model averages of every column at once."""
+    columns = [c for c in df.columns if SCORE_COLUMN.match(c) and SCORE_COLUMN.match(c).group('Category') in ideal_scores]
+
+    # Group by 'ModelKey', a concatenation of 'ModelFamily' and 'ModelType', and average all the score columns
+    model_keys = (df['ModelFamily'] + "_" + df['ModelType']).rename('ModelKey')
+    means = df[columns].apply(pd.to_numeric, errors='coerce').groupby(model_keys).mean()
+
+    # Melt to one row per (model, column), and split the column name into category, metric and year
+    long = means.reset_index().melt(id_vars='ModelKey', var_name='Column', value_name='Value')
+    parts = long['Column'].str.extract(SCORE_COLUMN)
+    long = pd.concat([parts, long[['ModelKey', 'Value']]], axis=1)
+    long['Year'] = long['Year'].astype(int)
+
+    # BVT and SOL side by side
+    cube = long.set_index(['Category', 'Year', 'ModelKey', 'Metric'])['Value'].unstack('Metric')
+    cube = cube.reindex(columns=['BVT', 'SOL']).rename(columns={'BVT': 'Score', 'SOL': 'HardnessScore'}).reset_index()
+    cube.columns.name = None
+
+    # Drop rows with missing score, normalize to the ideal score of the category
+    cube = cube.dropna(subset=['Score'])
+    cube['NormalizedScore'] = cube['Score'] / cube['Category'].map(ideal_scores)
+    cube['Category'] = pd.Categorical(cube['Category'], categories=categories)
+    cube = cube.sort_values(['Category', 'Year', 'ModelKey'], kind='stable').reset_index(drop=True)
+    return cube[['Category', 'Year', 'ModelKey', 'Score', 'NormalizedScore', 'HardnessScore']]
+
+def hardest_models(cube, count=10):
+    """The models with the lowest score over all categories in the latest year of the data."""
+    if cube.empty:
+        return []
+    latest = cube[cube['Year'] == cube['Year'].max()]
+    lowest = latest.groupby('ModelKey')['Score'].min()
+    return lowest.sort_values(kind='stable').index[:count].tolist()
+
+def json_values(column):
+    # averages rounded as in the CSV file, missing values as null
+    if column.dtype.kind == 'f':
+        return [float('%.6g' % v) if pd.notna(v) else None for v in column]
+    return column.tolist()
+
+def write_shards(cube, folder):
+    """DATA_FOLDER/index.json, and DATA_FOLDER/<n>.json with the series of the n-th model of the index.
+
+    The index holds what the page needs before any series is loaded: the model
+    keys, the axis range of each category and score type, and the HARDEST
+    models of each category and year.
+    """
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    models = sorted(cube['ModelKey'].unique().tolist())
+    position = {model: i for i, model in enumerate(models)}
+
+    index = {'models': models, 'categories': [], 'ideal_scores': ideal_scores, 'max': {}, 'hardest': {}}
+    for category, rows in cube.groupby('Category', observed=True, sort=True):
+        index['categories'].append(category)
+        index['max'][category] = {col: float(rows[col].max()) for col in ['Score', 'NormalizedScore', 'HardnessScore']}
+        # rows are sorted by year then model key: a stable sort on the score gives the page's ranking
+        ranked = rows.sort_values(['Year', 'Score'], kind='stable')
+        index['hardest'][category] = {
+            str(year): [position[model] for model in group['ModelKey'].head(HARDEST)]
+            for year, group in ranked.groupby('Year', sort=True)}
+    with open(os.path.join(folder, 'index.json'), 'w') as f:
+        f.write(json.dumps(index, separators=(',', ':')))
+
+    # one shard per model: {category: {"Year": [...], "Score": [...], "HardnessScore": [...]}}
+    for model, rows in cube.groupby('ModelKey', sort=True):
+        series = {category: {col: json_values(group[col]) for col in ['Year', 'Score', 'HardnessScore']}
+                  for category, group in rows.groupby('Category', observed=True, sort=True)}
+        with open(os.path.join(folder, f'{position[model]}.json'), 'w') as f:
+            f.write(json.dumps(series, separators=(',', ':')))
+
+def build(env, folder='.'):
+    # Load original CSV file
+    df = pd.read_csv(os.path.join(folder, "ModelHardness.csv"))
+
+    # Build the whole (category, year, model) cube, and save it as one long CSV file
+    cube = hardness_cube(df)
+    cube.drop(columns='NormalizedScore').to_csv(os.path.join(folder, CUBE_FILE), index=False, float_format='%.6g')
+    write_shards(cube, os.path.join(folder, DATA_FOLDER))
+
+    # Load the template
+    template = env.get_template('hardness_plot.html')
+
+    # Render the template; the page loads the series of the shown models only
+    years = sorted(cube['Year'].unique().tolist())
+    rendered_template = template.render(data_folder=DATA_FOLDER, cube_file=CUBE_FILE, years=years,
+                                        initial_model_keys=hardest_models(cube))
+
+    # Write the rendered template to a file
+    with open(os.path.join(folder, 'hardness_plot_rendered.html'), 'w') as f:
+        f.write(rendered_template)
+
+if __name__ == "__main__":
+    # Set up Jinja2 template environment
+    build(Environment(loader=FileSystemLoader("templates")))
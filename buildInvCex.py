@@ -1,23 +1,24 @@
 from jinja2 import Environment, FileSystemLoader
-import pandas as pd
-import json
+import os
 
-# Configure Jinja2 environment
-env = Environment(loader=FileSystemLoader('./templates'))
+def build(env, folder='.'):
+    # Create the index.html file
+    index_template = env.get_template("invcex.html")
+    with open(os.path.join(folder, "invcex/invcex.html"), "w") as index_file:
+        index_file.write(index_template.render())
 
-# Create the index.html file
-index_template = env.get_template("invcex.html")
-with open("invcex/invcex.html", "w") as index_file:
-    index_file.write(index_template.render())
 
+    # Create the toolinvcex.html file
+    template = env.get_template("toolinvcex.html")
+    with open(os.path.join(folder, "invcex/toolinvcex.html"), "w") as out_file:
+        out_file.write(template.render())
 
-# Create the toolinvcex.html file
-template = env.get_template("toolinvcex.html")
-with open("invcex/toolinvcex.html", "w") as out_file:
-    out_file.write(template.render())
-    
 
-# Create the toolinvcex.html file
-template = env.get_template("toolinvcexhard.html")
-with open("invcex/toolinvcexhard.html", "w") as out_file:
-    out_file.write(template.render())
+    # Create the toolinvcex.html file
+    template = env.get_template("toolinvcexhard.html")
+    with open(os.path.join(folder, "invcex/toolinvcexhard.html"), "w") as out_file:
+        out_file.write(template.render())
+
+if __name__ == "__main__":
+    # Configure Jinja2 environment
+    build(Environment(loader=FileSystemLoader('./templates')))
@@ -1,70 +1,100 @@
 import os
 import json
+import numpy as np
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 
+from toolIndex import read_header
+
 JSON_DIR = './'
 
 def write_json_file(filename, data):
     with open(filename, 'w') as f:
-        json.dump(data, f)
+        f.write(json.dumps(data, separators=(',', ':')))
+
+def create_sorted_tool_list(folder='.'):
+    # the header of the packed index gives the number of answers of each tool
+    header = read_header(os.path.join(folder, 'tool_index_packed.json'))
+    header.sort(key=lambda tool: tool['answers'], reverse=True)
+    return [tool['name'] for tool in header]
+
+FILTER_COLUMNS = ['Examination','ModelType','FormulaType','Nupn']  # Update this list with any additional filter columns
+
+def load_resolution_file(filter_columns=FILTER_COLUMNS, folder='.'):
+    return pd.read_csv(os.path.join(folder, 'resolution.csv'), usecols=['Index'] + filter_columns)
 
-def create_sorted_tool_list():
-    with open('tool_index_dict.json') as f:
-        tool_index_dict = json.load(f)
-    
-    tools = list(tool_index_dict.keys())
-    tools.sort(key=lambda x: len(tool_index_dict[x]['answers']), reverse=True)
-    return tools
+def group_indices(df, filter_columns):
+    """Yield (column, value, sorted Index array) for every value of every filter column.
 
-def load_resolution_file():
-    return pd.read_csv('resolution.csv')
+    Each column is factorized and sorted once, instead of one comparison over
+    the whole table per value. Missing values are grouped under "NA".
+    """
+    index = df['Index'].to_numpy()
+    for col in filter_columns:
+        codes, uniques = pd.factorize(df[col])
+        values = [str(v) for v in uniques]
+        if (codes < 0).any():
+            codes = np.where(codes < 0, len(values), codes)
+            values.append('NA')
+        order = np.lexsort((index, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        for code, value in enumerate(values):
+            yield col, value, index[order[bounds[code]:bounds[code + 1]]]
+
+def encode_runs(indices):
+    """Sorted integers as consecutive runs: [gap, length, gap, length, ...], gap counted from the previous run's end."""
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = indices[np.r_[0, breaks]]
+    ends = indices[np.r_[breaks - 1, len(indices) - 1]] + 1
+    gaps = starts - np.r_[0, ends[:-1]]
+    return np.column_stack([gaps, ends - starts]).ravel().tolist()
 
 def generate_filters(df, filter_columns):
     filters = {col: {} for col in filter_columns}
+    groups = {col: [] for col in filter_columns}
+    for col, value, indices in group_indices(df, filter_columns):
+        groups[col].append((value, indices))
 
     for col in filter_columns:
-        unique_values = df[col].unique().tolist()
-	
         # Don't create filter if only one unique value
-        if len(unique_values) <= 1:
+        if len(groups[col]) <= 1:
             continue
 
-        for value in unique_values:
-            index_set = set(df[df[col] == value]['Index'].astype(str))
-            filters[col][value] = sorted(list(index_set))  # Convert set to list
-    
+        for value, indices in groups[col]:
+            filters[col][value] = encode_runs(indices)
+
     return filters
 
-def write_filter_files(filters):
-    write_json_file('filters.json', filters)
+def write_filter_files(filters, folder='.'):
+    write_json_file(os.path.join(folder, 'filters.json'), filters)
 
-def generate_html(sorted_tools, filters, template):
+def generate_html(sorted_tools, filters, template, folder='.'):
     output = template.render(sorted_tools=sorted_tools, filters=filters)
 
-    with open('venn_dynamic.html', 'w') as f:
+    with open(os.path.join(folder, 'venn_dynamic.html'), 'w') as f:
         f.write(output)
 
-def main():
-    env = Environment(loader=FileSystemLoader("./templates"))
+def build(env, folder='.'):
     template = env.get_template('jvenn.html')
 
     categories = ['state_space', 'global_properties', 'reachability', 'ctl', 'ltl', 'upper_bounds']
 
     for category in categories:
-        os.chdir(category)
+        category_folder = os.path.join(folder, category)
 
-        sorted_tools = create_sorted_tool_list()  
+        sorted_tools = create_sorted_tool_list(category_folder)
 
-        df_resolution = load_resolution_file()
+        df_resolution = load_resolution_file(folder=category_folder)
 
-        filter_columns = ['Examination','ModelType','FormulaType','Nupn']  # Update this list with any additional filter columns
-        filters = generate_filters(df_resolution, filter_columns)
-        write_filter_files(filters)
+        filters = generate_filters(df_resolution, FILTER_COLUMNS)
+        write_filter_files(filters, category_folder)
 
-        generate_html(sorted_tools, filters, template)
+        generate_html(sorted_tools, filters, template, category_folder)
 
-        os.chdir('..')
+def main():
+    build(Environment(loader=FileSystemLoader("./templates")))
 
 if __name__ == "__main__":
     main()
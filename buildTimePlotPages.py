@@ -2,26 +2,6 @@ import os
 import jinja2
 import glob
 
-# Get the list of all PNG images in the current directory
-images = [f for f in os.listdir() if f.endswith('.png')]
-
-# Setup Jinja2 environment
-env = jinja2.Environment(
-    loader=jinja2.FileSystemLoader(searchpath="./templates"),
-    autoescape=jinja2.select_autoescape(['html', 'xml'])
-)
-
-# Load base template
-template = env.get_template("time_plots.html")
-
-# Render the template with the list of images
-html_output = template.render(images=images)
-
-# Write the output to a file
-with open('timeplots.html', 'w') as f:
-    f.write(html_output)
-
-
 # Define categories and examinations
 categories = {
     "state_space": ["StateSpace"],
@@ -32,39 +12,63 @@ categories = {
     "upper_bounds": ["UpperBounds"]
 }
 
-# Get the annual_plot.html template
-template = env.get_template('annual_plot.html')
+def make_environment(searchpath="./templates", **kwargs):
+    # Setup Jinja2 environment; these pages are rendered with autoescape
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(searchpath=searchpath),
+        autoescape=jinja2.select_autoescape(['html', 'xml']),
+        **kwargs
+    )
 
-# Create a list to hold links to the individual plot pages
-plot_links = []
+def build(env, folder='.'):
+    # Get the list of all PNG images in the folder
+    images = [f for f in os.listdir(folder) if f.endswith('.png')]
 
-# Loop over all categories
-for category, examinations in categories.items():
-    # List of CSV files for the category and its examinations
-    csv_files = [f'csv/answer_{category}_time.csv']
-    csv_files += [f'csv/answer_{examination}_time.csv' for examination in examinations]
-    
-    # Compute the plot_id
-    plot_id = 'plot_' + category
+    # Load base template
+    template = env.get_template("time_plots.html")
 
-    # Render the template with the CSV data
-    html = template.render(plot_id=plot_id, csv_files=csv_files,min_year=2016,max_year=2026)
+    # Render the template with the list of images
+    html_output = template.render(images=images)
 
-    # Write the rendered HTML to a file
-    html_file = './' + category + '_annual.html'
-    with open(html_file, 'w') as f:
-        f.write(html)
+    # Write the output to a file
+    with open(os.path.join(folder, 'timeplots.html'), 'w') as f:
+        f.write(html_output)
+
+    # Get the annual_plot.html template
+    template = env.get_template('annual_plot.html')
 
-    # Add a link to this plot page to the list of plot links
-    plot_links.append((category, html_file))
+    # Create a list to hold links to the individual plot pages
+    plot_links = []
 
-# Get the pluriannual_plots.html template
-template = env.get_template('pluriannual_plots.html')
+    # Loop over all categories
+    for category, examinations in categories.items():
+        # List of CSV files for the category and its examinations
+        csv_files = [f'csv/answer_{category}_time.csv']
+        csv_files += [f'csv/answer_{examination}_time.csv' for examination in examinations]
 
-# Render the template with the list of plot links
-html = template.render(plot_links=plot_links)
+        # Compute the plot_id
+        plot_id = 'plot_' + category
+
+        # Render the template with the CSV data
+        html = template.render(plot_id=plot_id, csv_files=csv_files,min_year=2016,max_year=2026)
+
+        # Write the rendered HTML to a file
+        html_file = './' + category + '_annual.html'
+        with open(os.path.join(folder, html_file), 'w') as f:
+            f.write(html)
+
+        # Add a link to this plot page to the list of plot links
+        plot_links.append((category, html_file))
+
+    # Get the pluriannual_plots.html template
+    template = env.get_template('pluriannual_plots.html')
+
+    # Render the template with the list of plot links
+    html = template.render(plot_links=plot_links)
+
+    # Write the rendered HTML to a file
+    with open(os.path.join(folder, 'PluriAnnual_dynamic.html'), 'w') as f:
+      f.write(html)
 
-# Write the rendered HTML to a file
-with open('PluriAnnual_dynamic.html', 'w') as f:
-  f.write(html)
-  
+if __name__ == "__main__":
+    build(make_environment())
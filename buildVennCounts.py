@@ -0,0 +1,101 @@
+"""Precomputed Venn region counts for venn_dynamic.html.
+
+For the TOP_TOOLS tools with the most answers and every combination of the
+filter values of buildJVennPages.py ("All" included), count the queries of
+each membership pattern: pattern p gathers the queries answered by exactly the
+top tools whose bit is set in p. Any three of these tools then give their
+seven Venn regions by summing patterns, so the page draws without touching the
+answer lists, and only loads them (tool_index_packed.json, filters.json) to
+list the queries of a region or to draw other tools.
+
+Counts are bitset popcounts: one packed bitset per pattern (from the tools'
+answer bitsets of toolMatrix.py) AND one bitset per filter combination.
+
+venn_counts.json: {"tools": [...], "columns": [...], "values": {column: [...]},
+"counts": [[count of pattern p, ...] for each combination]}, combinations
+enumerated with the last column varying fastest, value 0 meaning "All".
+
+Usage: python3 buildVennCounts.py [-top N]
+"""
+import argparse
+import json
+import os
+import time
+from itertools import product
+
+import numpy as np
+
+from buildJVennPages import FILTER_COLUMNS, create_sorted_tool_list, group_indices, load_resolution_file
+from runReport import record
+from toolIndex import CATEGORIES, decode_list
+from toolMatrix import ToolQueryMatrix
+
+TOP_TOOLS = 6
+
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+def popcount(bits):
+    """Number of set bits of each row of a 2D uint64 array."""
+    return POPCOUNT[bits.view(np.uint8)].sum(axis=-1)
+
+
+def pattern_bitsets(matrix, tools):
+    """patterns[p]: queries answered by exactly the tools whose bit is set in p."""
+    patterns = matrix.pack(np.arange(1, matrix.n_queries + 1))[None, :]
+    for tool in tools:
+        bits = matrix.tools[tool]
+        # bit i of the pattern number is tool i: the new patterns come after the old ones
+        patterns = np.concatenate([patterns & ~bits, patterns & bits])
+    return patterns
+
+
+def venn_counts(df, answers, tools, filter_columns=FILTER_COLUMNS):
+    matrix = ToolQueryMatrix({tool: answers[tool] for tool in tools}, int(df['Index'].max()) if len(df) else 0)
+    patterns = pattern_bitsets(matrix, tools)
+
+    everything = matrix.pack(np.arange(1, matrix.n_queries + 1))
+    values = {col: [] for col in filter_columns}
+    choices = {col: [everything] for col in filter_columns}
+    for col, value, indices in group_indices(df, filter_columns):
+        values[col].append(value)
+        choices[col].append(matrix.pack(indices))
+    for col in filter_columns:
+        # same rule as the filters of the page: no choice for a single value
+        if len(values[col]) <= 1:
+            values[col], choices[col] = [], choices[col][:1]
+
+    counts = []
+    for combination in product(*(choices[col] for col in filter_columns)):
+        mask = everything
+        for bits in combination:
+            mask = mask & bits
+        counts.append(popcount(patterns & mask).tolist())
+    return {'tools': list(tools), 'columns': list(filter_columns), 'values': values, 'counts': counts}
+
+
+def load_answers(tools, folder='.'):
+    with open(os.path.join(folder, 'tool_index_packed.json')) as f:
+        packed = json.load(f)
+    names = [tool['name'] for tool in packed['tools']]
+    return {tool: decode_list(packed['answers'][names.index(tool)]) for tool in tools}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write <category>/venn_counts.json for the Venn pages.")
+    ap.add_argument('-top', type=int, default=TOP_TOOLS, help=f"number of tools (default {TOP_TOOLS})")
+    args = ap.parse_args()
+
+    for category in CATEGORIES:
+        start_time = time.time()
+        tools = create_sorted_tool_list(category)[:args.top]
+        data = venn_counts(load_resolution_file(folder=category), load_answers(tools, category), tools)
+        with open(os.path.join(category, 'venn_counts.json'), 'w') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+        elapsed_time = time.time() - start_time
+        print(f"Processed {category}: {len(data['counts'])} filter combinations in {elapsed_time:.2f} seconds.")
+        record(category, category=category, rows_out=len(data['counts']), seconds=elapsed_time)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Chunked ingestion: the category outputs of a raw CSV, built chunk by chunk.
+
+buildCategories.py -chunk ROWS reads raw-result-analysis.csv ROWS lines at a
+time instead of exploding the whole year into the long table: a first pass
+over the masks finds the widest one (the width every chunk is exploded to, as
+in ingestResults.py), then each chunk is exploded, its rows are routed by
+Examination to their category, and a CategoryStream per category keeps only
+what its outputs need:
+
+- the answer ("T") and error ("X") counts per (Tool, Examination) of each chunk, for scores.csv;
+- the distinct (query, Result) pairs answered "T" of each chunk; once all chunks
+  are read, the first appearance of each pair is a resolution entry, numbered as Index;
+- per tool, the query keys of its "T" and "X" rows (one int64 per row, the
+  (model, Examination, ID) packed), joined to the Index of their query's
+  entries at the end, for the tool indexes.
+
+Memory is one chunk plus these. It is not bounded: the resolution entries and
+query keys are kept until the end, so memory grows with the number of distinct
+queries and answers of the year, but no longer with the exploded long table or
+the width of the examinations. On synthetic years, the peak was 146 MB against
+140 MB in memory for a 5 MB raw CSV, and 225 MB against 479 MB for a 33 MB one
+(-chunk 100000). Each chunk is processed with pandas and numpy operations,
+without a loop over its rows.
+
+The mode is opt-in: the pipeline reads the columnar store (see resultStore.py),
+which holds the whole long table. The outputs are those of the in-memory path,
+byte for byte, as long as no (tool, Input, Examination) is repeated in two
+different chunks: such a key is cross-joined with its twins within each chunk
+only. Keys are unique in the MCC archives.
+"""
+import numpy as np
+import pandas as pd
+
+from ingestResults import MODEL_COLUMNS, contest_rows, explode, mask_width, read_raw_chunks, split_models
+
+
+class CategoryStream:
+    """The outputs of one category, accumulated over the chunks of the long table."""
+
+    def __init__(self):
+        self.tools = {}          # tool -> {'T': [query key arrays], 'X': [...]}, in order of appearance
+        self.counts = []         # answer and error counts per (Tool, Examination) of each chunk
+        self.examinations = []   # in order of appearance
+        self.entries = []        # (key, model, Examination, ID, Result) of the distinct solved pairs of each chunk
+        self.merged = None
+
+    def add(self, tool, model, exam, qid, verdict, result, key):
+        """Rows of the category in long table order: columns as arrays, key the query key of each row."""
+        for name in pd.unique(tool):
+            self.tools.setdefault(name, {'T': [], 'X': []})
+        for name in pd.unique(exam):
+            if name not in self.examinations:
+                self.examinations.append(name)
+
+        answer, error = verdict == 'T', verdict == 'X'
+        frame = pd.DataFrame({'Tool': tool, 'Examination': exam, 'answer': answer, 'error': error})
+        self.counts.append(frame.groupby(['Tool', 'Examination'])[['answer', 'error']].sum())
+        for field, rows in (('T', answer), ('X', error)):
+            for name, keys in pd.Series(key[rows]).groupby(tool[rows], sort=False):
+                self.tools[name][field].append(keys.to_numpy())
+
+        # (query, Result) pairs answered "T", first appearance in the chunk; the pairs
+        # already seen in earlier chunks are dropped once all chunks are read
+        solved = np.flatnonzero(answer)
+        rows = solved[~pd.DataFrame({'key': key[solved], 'Result': result[solved]}).duplicated().to_numpy()]
+        self.entries.append((key[rows], model[rows], exam[rows], qid[rows], result[rows]))
+
+    def columns(self):
+        """key, model, Examination, ID and Result of every entry, in order of Index."""
+        if self.merged is None:
+            if not self.entries:
+                self.entries.append((np.array([], dtype=np.int64), np.array([], dtype=np.int64),
+                                     np.array([], dtype=object), np.array([], dtype=np.int64), np.array([], dtype=object)))
+            parts = [np.concatenate(part) for part in zip(*self.entries)]
+            first = ~pd.DataFrame({'key': parts[0], 'Result': parts[4]}).duplicated().to_numpy()
+            key, model, exam, qid, result = (part[first] for part in parts)
+            result = np.where(pd.isna(result), None, result)
+            self.merged = key, model, exam, qid, result
+            self.entries = []
+        return self.merged
+
+    def resolution(self, models):
+        """The resolution table (before Solutions), models the (Family, Type, Instance) of each model number."""
+        _, model, exam, qid, result = self.columns()
+        resolution = pd.DataFrame({'Index': np.arange(1, len(model) + 1)})
+        for k, column in enumerate(MODEL_COLUMNS):
+            resolution[column] = pd.Series([models[m][k] for m in model.tolist()], dtype=object)
+        resolution['Examination'] = pd.Series(exam, dtype=object)
+        resolution['ID'] = qid.astype(np.int64)
+        resolution['Consensus'] = pd.Series(result, dtype=object)
+        return resolution
+
+    def tool_index(self):
+        """Sorted answer and error Index of each tool, the BVT last, as build_tool_index gives them."""
+        entry_key = self.columns()[0]
+        # the Index of every entry of each query, grouped by query key
+        order = np.argsort(entry_key, kind='stable')
+        keys, start, count = np.unique(entry_key[order], return_index=True, return_counts=True)
+
+        def indices(queries):
+            # each row joins every entry of its query, as the left join does
+            if not len(keys):
+                return np.array([], dtype=np.int64)
+            at = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+            n = np.where(keys[at] == queries, count[at], 0)
+            offset = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+            return np.sort(order[np.repeat(start[at], n) + offset] + 1)
+
+        def joined(arrays):
+            return indices(np.concatenate(arrays)) if arrays else np.array([], dtype=np.int64)
+
+        tool_index = {name: {'answers': joined(rows['T']), 'errors': joined(rows['X'])}
+                      for name, rows in self.tools.items()}
+        if len(entry_key):
+            # one BVT row per entry
+            tool_index['BVT'] = {'answers': indices(entry_key), 'errors': np.array([], dtype=np.int64)}
+        return tool_index
+
+    def per_exam(self):
+        """Answer and error counts per (Tool, Examination), with the BVT, sorted as a groupby."""
+        exam = pd.Series(self.columns()[2], dtype=object)
+        bvt = pd.DataFrame({'Tool': 'BVT', 'Examination': exam, 'answer': 1, 'error': 0})
+        counts = self.counts + [bvt.groupby(['Tool', 'Examination'])[['answer', 'error']].sum()]
+        return pd.concat(counts).groupby(level=['Tool', 'Examination']).sum().astype(np.int64)
+
+
+class Codes:
+    """Dense numbers of the value tuples of categorical columns, in order of first use."""
+
+    def __init__(self):
+        self.numbers = {}
+        self.values = []
+
+    def encode(self, columns):
+        """Number of each row of the columns (NaN as None)."""
+        sizes = [len(column.cat.categories) + 1 for column in columns]
+        combined = np.zeros(len(columns[0]), dtype=np.int64)
+        for column, size in zip(columns, sizes):
+            combined = combined * size + column.cat.codes.to_numpy().astype(np.int64) + 1
+        unique, inverse = np.unique(combined, return_inverse=True)
+        numbers = np.empty(len(unique), dtype=np.int64)
+        for i, code in enumerate(unique.tolist()):
+            value = []
+            for column, size in zip(reversed(columns), reversed(sizes)):
+                code, part = divmod(code, size)
+                value.append(None if part == 0 else column.cat.categories[part - 1])
+            value = tuple(reversed(value))
+            if value not in self.numbers:
+                self.numbers[value] = len(self.values)
+                self.values.append(value)
+            numbers[i] = self.numbers[value]
+        return numbers[inverse]
+
+
+def stream_categories(source, categories, rows):
+    """CategoryStream of every category, the (Family, Type, Instance) of the model numbers and the models table."""
+    width = 0
+    inputs = {}
+    for raw in read_raw_chunks(source, rows):
+        inputs.update(dict.fromkeys(raw['Input']))
+        raw = contest_rows(raw)
+        if len(raw):
+            width = max(width, mask_width(raw['mask']))
+    models = split_models(pd.Series(list(inputs), dtype=object)).drop_duplicates().reset_index(drop=True)
+
+    category_of = {exam: name for name, exams in categories.items() for exam in exams}
+    streams = {name: CategoryStream() for name in categories}
+    model_codes, exam_codes = Codes(), Codes()
+    for raw in read_raw_chunks(source, rows):
+        raw = contest_rows(raw)
+        if not len(raw):
+            continue
+        long = explode(raw, width)
+        tool = long['Tool'].astype(object).to_numpy()
+        exam = long['Examination'].astype(object).to_numpy()
+        qid = long['ID'].to_numpy()
+        model = model_codes.encode([long[c] for c in MODEL_COLUMNS])
+        # a query is a (model, Examination, ID)
+        key = (model << 24) | (exam_codes.encode([long['Examination']]) << 16) | qid.astype(np.int64)
+        verdict = long['Verdict'].astype(object).to_numpy()
+        result = long['Result'].to_numpy(dtype=object)
+        category = pd.Series(exam).map(category_of).to_numpy()
+        for name, stream in streams.items():
+            rows_of = np.flatnonzero(category == name)
+            if len(rows_of):
+                stream.add(tool[rows_of], model[rows_of], exam[rows_of], qid[rows_of], verdict[rows_of],
+                           result[rows_of], key[rows_of])
+    return streams, model_codes.values, models
@@ -1,51 +1,40 @@
-import csv
-import sys
+import argparse
+import glob
 import os
 
+from htmlTable import expand_folders, run_all, write_csv_table
+
 def csv_to_html(csv_file):
     # Create the HTML file path
     html_file = os.path.splitext(csv_file)[0] + '.html'
 
-    # Open the CSV file
-    with open(csv_file, 'r') as csvfile:
-        reader = csv.reader(csvfile)
-        rows = list(reader)
-
-    # Create the HTML table
-    html_table = '<table>\n'
-
-    # Generate the table header
-    html_table += '  <tr>\n'
-    for cell in rows[0]:
-        html_table += f'    <th>{cell}</th>\n'
-    html_table += '  </tr>\n'
-
-    # Generate the table rows
-    for row in rows[1:]:
-        html_table += '  <tr>\n'
-        for cell in row:
-            html_table += f'    <td>{cell}</td>\n'
-        html_table += '  </tr>\n'
-
-    html_table += '</table>'
-
-    # Write the HTML table to the file
+    # Stream the CSV rows into the HTML table
     with open(html_file, 'w') as htmlfile:
-        htmlfile.write(html_table)
-
-    print(f"HTML table generated: {html_file}")
-
-# Check if CSV files are provided as arguments
-if len(sys.argv) < 2:
-    print("Please provide the CSV file(s) as arguments.")
-    sys.exit(1)
-
-# Process each CSV file
-for csv_file in sys.argv[1:]:
-    # Check if the CSV file exists
-    if not os.path.isfile(csv_file):
-        print(f"CSV file not found: {csv_file}")
-        continue
-
-    # Convert the CSV file to HTML
-    csv_to_html(csv_file)
+        write_csv_table(csv_file, htmlfile)
+
+    print(f"HTML table generated: {html_file}", flush=True)
+
+def csv_files(paths, name):
+    # A folder (category, year or website folder) stands for the <name> files of its categories
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += [f for folder in expand_folders([path]) for f in sorted(glob.glob(os.path.join(folder, name)))]
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"CSV file not found: {path}")
+    return files
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert CSV files to plain HTML tables.")
+    ap.add_argument('paths', nargs='+', help="CSV files, or folders standing for the -name files of their categories")
+    ap.add_argument('-name', default='*.csv', help="CSV files to convert in the given folders (default: *.csv)")
+    ap.add_argument('-j', type=int, default=1, help="convert files on N cores (0 = all cores)")
+    args = ap.parse_args()
+
+    # Convert all the CSV files in this process, or spread them over -j processes
+    run_all(csv_to_html, csv_files(args.paths, args.name), args.j)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Fingerprints of input files, and the per-archive JSON caches built on them.
+
+horacle/buildForms.py and modelData/collectData.py keep what they read from
+each archive in a JSON cache ({"version", "archives": {name: entry}}); an
+entry records the archive's size, mtime and sha256, so a rerun only opens the
+archives that changed. An archive whose mtime moved but whose size did not
+(re-extracted, copied) is compared by content. horacle/probes/probe_index.py
+checks its pickled index against the same fingerprints.
+"""
+import hashlib
+import json
+import os
+
+CHUNK = 1 << 20
+
+
+def digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def fingerprint(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime": st.st_mtime_ns, "sha256": digest(path)}
+
+
+def load_cache(path, version):
+    """The archive entries of a cache file; none if it is missing or of another version."""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return cache.get("archives", {}) if cache.get("version") == version else {}
+
+
+def save_cache(path, archives, version):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"version": version, "archives": archives}, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def lookup(entry, path, st):
+    """True if the cached entry still describes the file at path (st its os.stat)."""
+    if entry is None or entry["size"] != st.st_size:
+        return False
+    if entry["mtime"] == st.st_mtime_ns:
+        return True
+    # touched (re-extracted, copied) but maybe not changed: compare contents
+    if entry["sha256"] == digest(path):
+        entry["mtime"] = st.st_mtime_ns
+        return True
+    return False
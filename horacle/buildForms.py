@@ -15,69 +15,143 @@ archive* and, for each property, emit one line:
     all-paths/globally  -> AG ;  exists-path/finally -> EF
 - size: number of element nodes in the formula subtree (best-effort; not yet
   validated against hue's formula.Size; unused downstream).
+- each XML is streamed with iterparse and every <property> is cleared once
+  counted; with -j N the archives are spread over N worker processes. The
+  rows are merged and sorted the same way, so the output does not depend on -j.
+- with -cache FILE, the rows of every archive are kept in a JSON cache keyed by
+  the archive's size/mtime (and sha256 when the mtime moved but the size did
+  not), so a rerun only opens the archives that changed.
 """
 import argparse
+import multiprocessing
 import os
 import sys
 import tarfile
 import xml.etree.ElementTree as ET
 
+# fileCache.py is at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fileCache import digest, load_cache, lookup, save_cache
+
 EXAMINATIONS = ["ReachabilityCardinality", "ReachabilityFireability"]
+CACHE_VERSION = 1
+MODALITIES = {"all-paths": "AG", "exists-path": "EF"}
 
 
 def local(tag):
     return tag.rsplit('}', 1)[-1]
 
 
-def modality(formula_el):
-    children = list(formula_el)
-    if not children:
-        return None
-    top = local(children[0].tag)
-    return {"all-paths": "AG", "exists-path": "EF"}.get(top)
-
-
-def size(formula_el):
-    return sum(1 for _ in formula_el.iter())
-
-
 def process_xml(fileobj, model, exam, out, unknown):
-    root = ET.parse(fileobj).getroot()
-    ns = root.tag.split('}')[0].strip('{')
-    q = lambda t: f"{{{ns}}}{t}"
-    for k, prop in enumerate(root.findall(q("property"))):
-        formula_el = prop.find(q("formula"))
-        if formula_el is None:
+    """Stream one formula file; depth 1 is the root, 2 a <property>, 3 its
+    <formula>, 4 the top temporal operator."""
+    depth, k = 0, -1
+    root = prop_tag = formula_tag = None
+    in_prop = in_formula = False
+    seen_formula, mod, sz = False, None, 0
+    for event, el in ET.iterparse(fileobj, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                root = el
+                ns = el.tag.split('}')[0].strip('{')
+                prop_tag, formula_tag = f"{{{ns}}}property", f"{{{ns}}}formula"
+            elif depth == 2:
+                in_prop = el.tag == prop_tag
+                if in_prop:
+                    k += 1
+                    seen_formula, mod, sz = False, None, 0
+            elif in_formula:
+                sz += 1
+                if sz == 2:  # first child of <formula>
+                    mod = MODALITIES.get(local(el.tag))
+            elif depth == 3 and in_prop and not seen_formula and el.tag == formula_tag:
+                in_formula = seen_formula = True
+                sz = 1
             continue
-        key = f"{model}-{exam}-{k:02d}"
-        mod = modality(formula_el)
-        if mod is None:
-            unknown.append(key)
-            mod = "??"
-        out.append((key, mod, size(formula_el)))
+        depth -= 1
+        if depth == 2 and in_formula:
+            in_formula = False
+        elif depth == 1:
+            if in_prop and seen_formula:
+                key = f"{model}-{exam}-{k:02d}"
+                if mod is None:
+                    unknown.append(key)
+                    mod = "??"
+                out.append((key, mod, sz))
+            in_prop = False
+            root.clear()
+
+
+def process_archive(path):
+    """Rows and unknown-modality keys of one <model>.tgz (pool worker)."""
+    model = os.path.basename(path)[:-4]
+    rows, unknown = [], []
+    with tarfile.open(path) as tar:
+        for exam in EXAMINATIONS:
+            member = f"{model}/{exam}.xml"
+            try:
+                f = tar.extractfile(member)
+            except KeyError:
+                f = None
+            if f is not None:
+                process_xml(f, model, exam, rows, unknown)
+    return rows, unknown
+
+
+def scan_archive(path):
+    """process_archive plus the archive's digest, for the cache (pool worker)."""
+    return process_archive(path)[0], digest(path)
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("-inputs", required=True, help="folder of per-model <model>.tgz")
     ap.add_argument("-o", default="-", help="output file (default stdout)")
+    ap.add_argument("-j", type=int, default=1,
+                    help="worker processes (default 1 = serial, 0 = all cores)")
+    ap.add_argument("-cache", help="per-archive JSON cache; only changed archives are re-read")
     args = ap.parse_args()
 
-    rows, unknown, nmodels = [], [], 0
-    for fn in sorted(os.listdir(args.inputs)):
-        if not fn.endswith(".tgz"):
-            continue
-        model = fn[:-4]
-        nmodels += 1
-        with tarfile.open(os.path.join(args.inputs, fn)) as tar:
-            for exam in EXAMINATIONS:
-                member = f"{model}/{exam}.xml"
-                try:
-                    f = tar.extractfile(member)
-                except KeyError:
-                    f = None
-                if f is not None:
-                    process_xml(f, model, exam, rows, unknown)
+    names = [fn for fn in sorted(os.listdir(args.inputs)) if fn.endswith(".tgz")]
+    paths = [os.path.join(args.inputs, fn) for fn in names]
+    nmodels = len(paths)
+    jobs = args.j or os.cpu_count() or 1
+
+    cached = load_cache(args.cache, CACHE_VERSION) if args.cache else {}
+    archives, todo = {}, []
+    for fn, path in zip(names, paths):
+        st = os.stat(path)
+        entry = cached.get(fn)
+        if args.cache and lookup(entry, path, st):
+            archives[fn] = entry
+        else:
+            archives[fn] = {"size": st.st_size, "mtime": st.st_mtime_ns}
+            todo.append(fn)
+
+    worker = scan_archive if args.cache else process_archive
+    todo_paths = [os.path.join(args.inputs, fn) for fn in todo]
+    if jobs == 1:
+        results = map(worker, todo_paths)
+    else:
+        pool = multiprocessing.Pool(jobs)
+        # imap keeps the archive order, so the merge matches the serial run
+        results = pool.imap(worker, todo_paths, chunksize=8)
+    for fn, (r, extra) in zip(todo, results):
+        archives[fn]["rows"] = r
+        if args.cache:
+            archives[fn]["sha256"] = extra
+    if jobs != 1:
+        pool.close()
+        pool.join()
+
+    # splice fresh and cached rows back together in archive order
+    rows = [tuple(r) for fn in names for r in archives[fn]["rows"]]
+    unknown = [key for key, mod, _ in rows if mod == "??"]
+    if args.cache:
+        save_cache(args.cache, archives, CACHE_VERSION)
+        sys.stderr.write(f"cache: {nmodels - len(todo)} hits, {len(todo)} misses, "
+                         f"{len(set(cached) - set(archives))} dropped\n")
 
     rows.sort(key=lambda r: r[0].encode())  # bytewise (C locale), like the go pipeline
 
@@ -12,46 +12,140 @@ resolution.csv), combined with the formula modality:
 
 Output imitates horacle/conv/iscex2023.csv: "<key> <INV|CEX|UNKNOWN>", one line
 per reachability query, bytewise (C-locale) sorted, same keys as the forms file.
+
+- with -years, every listed year is built in one run, from conv/forms<year>.csv
+  and <website>/<year>/reachability/resolution.csv to conv/iscex<year>.csv,
+  the years spread over -j worker processes.
+- each pair of files is parsed once into arrays: the forms and resolution keys
+  are encoded together to integers in bytewise order, so the join is a
+  searchsorted over the sorted consensus codes (the last row of a key wins, as
+  in a dict) and the output order is a stable sort of the codes. The files are
+  byte-identical to those of the former line by line loop over a dict.
 """
 import argparse
-import csv
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
 
 TABLE = {("AG", "TRUE"): "INV", ("AG", "FALSE"): "CEX",
          ("EF", "TRUE"): "CEX", ("EF", "FALSE"): "INV"}
 
+CONV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conv")
+WEBSITE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "website")
+
+
+def read_forms(path):
+    """(keys, modalities) of a forms file: the first two fields of every line."""
+    with open(path) as f:
+        fields = pd.Series(f.read().splitlines(), dtype=object).str.split(n=2, expand=True)
+    if len(fields) == 0:
+        return np.array([], dtype=object), np.array([], dtype=object)
+    if fields.shape[1] < 2 or fields[1].isna().any():
+        raise ValueError(f"{path}: lines without a key and a modality")
+    return fields[0].to_numpy(dtype=object), fields[1].to_numpy(dtype=object)
+
+
+def read_consensus(path):
+    """(keys, verdicts) of every resolution row, in file order."""
+    res = pd.read_csv(path, dtype=str, keep_default_na=False, na_filter=False,
+                      usecols=["ModelFamily", "ModelType", "ModelInstance", "Examination", "ID", "Consensus"])
+    keys = (res["ModelFamily"] + "-" + res["ModelType"] + "-" + res["ModelInstance"]
+            + "-" + res["Examination"] + "-" + res["ID"])
+    return keys.to_numpy(dtype=object), res["Consensus"].str.strip().str.upper().to_numpy(dtype=object)
+
+
+def classify(form_keys, modalities, res_keys, verdicts):
+    """(key, category) rows of the forms keys, bytewise sorted."""
+    # one integer code per distinct key, codes in bytewise order
+    encoded = np.array([k.encode() for k in np.concatenate([form_keys, res_keys])], dtype=bytes)
+    _, codes = np.unique(encoded, return_inverse=True)
+    form_codes, res_codes = codes[:len(form_keys)], codes[len(form_keys):]
+
+    # last resolution row of each code, sorted by code
+    order = np.argsort(res_codes, kind="stable")
+    sorted_codes = res_codes[order]
+    last = np.append(sorted_codes[1:] != sorted_codes[:-1], True) if len(order) else np.array([], dtype=bool)
+    known_codes, known_verdicts = sorted_codes[last], verdicts[order][last]
+
+    # sorted merge of the forms codes against them
+    pos = np.searchsorted(known_codes, form_codes)
+    pos[pos == len(known_codes)] = 0
+    found = (known_codes[pos] == form_codes) if len(known_codes) else np.zeros(len(form_codes), dtype=bool)
+    verdict = np.where(found, known_verdicts[pos] if len(known_codes) else None, None)
+
+    cats = np.full(len(form_keys), "UNKNOWN", dtype=object)
+    for (mod, value), cat in TABLE.items():
+        cats[(modalities == mod) & (verdict == value)] = cat
+    out = np.argsort(form_codes, kind="stable")
+    return form_keys[out], cats[out]
+
+
+def write_iscex(path, keys, cats):
+    with open(path, "w") as f:
+        f.write("".join(f"{key} {cat}\n" for key, cat in zip(keys, cats)))
+
+
+def summary(cats, path):
+    values, counts = np.unique(cats.astype(str), return_counts=True)
+    c = dict(zip(values, counts))
+    return f"{len(cats)} rows -> {path}  INV={c.get('INV', 0)} CEX={c.get('CEX', 0)} UNKNOWN={c.get('UNKNOWN', 0)}"
+
+
+def build_year(task):
+    """Write iscex<year>.csv of one (forms, resolution, output) triple (pool worker)."""
+    forms, resolution, output = task
+    keys, cats = classify(*read_forms(forms), *read_consensus(resolution))
+    write_iscex(output, keys, cats)
+    return summary(cats, output)
+
+
+def parse_years(text):
+    years = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        years += range(int(first), int(last or first) + 1)
+    return years
+
+
+def batch(args):
+    tasks = [(os.path.join(args.conv, f"forms{year}.csv"),
+              os.path.join(args.website, str(year), "reachability", "resolution.csv"),
+              os.path.join(args.conv, f"iscex{year}.csv")) for year in parse_years(args.years)]
+    jobs = min(args.j or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1:
+        results = map(build_year, tasks)
+    else:
+        pool = multiprocessing.Pool(jobs)
+        results = pool.imap(build_year, tasks)
+    for line in results:
+        print(line)
+    if jobs > 1:
+        pool.close()
+        pool.join()
+
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("-forms", required=True, help="forms<year>.csv (key modality size)")
-    ap.add_argument("-resolution", required=True,
+    ap.add_argument("-forms", help="forms<year>.csv (key modality size)")
+    ap.add_argument("-resolution",
                     help="reachability resolution.csv (has a Consensus column)")
-    ap.add_argument("-o", required=True, help="output iscex<year>.csv")
+    ap.add_argument("-o", help="output iscex<year>.csv")
+    ap.add_argument("-years", help="batch mode: years to build, e.g. 2020-2025 or 2023,2025")
+    ap.add_argument("-conv", default=CONV, help="batch mode: folder of forms<year>.csv and iscex<year>.csv")
+    ap.add_argument("-website", default=WEBSITE, help="batch mode: folder of <year>/reachability/resolution.csv")
+    ap.add_argument("-j", type=int, default=0,
+                    help="batch mode: worker processes (default 0 = all cores, 1 = serial)")
     args = ap.parse_args()
 
-    consensus = {}
-    with open(args.resolution) as f:
-        for row in csv.DictReader(f):
-            key = (f"{row['ModelFamily']}-{row['ModelType']}-{row['ModelInstance']}"
-                   f"-{row['Examination']}-{row['ID']}")
-            consensus[key] = row["Consensus"].strip().upper()
-
-    rows = []
-    with open(args.forms) as f:
-        for line in f:
-            key, mod = line.split()[0], line.split()[1]
-            verdict = consensus.get(key)
-            cat = "UNKNOWN" if verdict is None else TABLE.get((mod, verdict), "UNKNOWN")
-            rows.append((key, cat))
-
-    rows.sort(key=lambda r: r[0].encode())
-    with open(args.o, "w") as f:
-        for key, cat in rows:
-            f.write(f"{key} {cat}\n")
-
-    from collections import Counter
-    c = Counter(cat for _, cat in rows)
-    print(f"{len(rows)} rows -> {args.o}  INV={c['INV']} CEX={c['CEX']} UNKNOWN={c['UNKNOWN']}")
+    if args.years:
+        batch(args)
+        return
+    if not (args.forms and args.resolution and args.o):
+        ap.error("-forms, -resolution and -o are required without -years")
 
+    print(build_year((args.forms, args.resolution, args.o)))
 
 if __name__ == "__main__":
     main()
@@ -6,50 +6,36 @@ modality x Consensus truth table:
     AG & TRUE  -> INV     AG & FALSE -> CEX
     EF & TRUE  -> CEX     EF & FALSE -> INV
 """
-import csv
-import re
-import sys
-
-FORMS = "horacle/conv/forms2025.csv"
-RESOLUTION = "website/2025/reachability/resolution.csv"
-
-YEAR = re.compile(r"-(?:19|20)\d\d-(\d\d)$")
-
-
-def strip_year(key):
-    """ARMCacheCoherence-...-ReachabilityCardinality-2025-00 -> ...-00"""
-    return YEAR.sub(r"-\1", key)
+import argparse
 
+from probe_index import add_arguments, index_from_args
 
 TABLE = {("AG", "TRUE"): "INV", ("AG", "FALSE"): "CEX",
          ("EF", "TRUE"): "CEX", ("EF", "FALSE"): "INV"}
 
 
-def main():
-    modality = {}
-    with open(FORMS) as f:
-        for line in f:
-            pid, mod, _size = line.split()
-            modality[strip_year(pid)] = mod
-
+def run(index):
     counts = {"INV": 0, "CEX": 0, "UNKNOWN": 0}
     matched = unmatched = 0
-    with open(RESOLUTION) as f:
-        for row in csv.DictReader(f):
-            key = f"{row['ModelFamily']}-{row['ModelType']}-{row['ModelInstance']}-{row['Examination']}-{row['ID']}"
-            mod = modality.get(key)
-            if mod is None:
-                unmatched += 1
-                continue
-            matched += 1
-            verdict = row["Consensus"].strip().upper()
-            counts[TABLE.get((mod, verdict), "UNKNOWN")] += 1
-
-    print(f"forms modality keys : {len(modality)}")
+    for model, exam, qid, verdict in index.reso_rows:
+        mod = index.modality.get(f"{model}-{exam}-{qid}")
+        if mod is None:
+            unmatched += 1
+            continue
+        matched += 1
+        counts[TABLE.get((mod, verdict), "UNKNOWN")] += 1
+
+    print(f"forms modality keys : {len(index.modality)}")
     print(f"resolution matched  : {matched}")
     print(f"resolution unmatched: {unmatched}")
     print(f"INV={counts['INV']}  CEX={counts['CEX']}  UNKNOWN={counts['UNKNOWN']}")
 
 
+def main():
+    ap = argparse.ArgumentParser()
+    add_arguments(ap)
+    run(index_from_args(ap.parse_args()))
+
+
 if __name__ == "__main__":
     main()
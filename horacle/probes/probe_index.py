@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Shared forms/resolution index of a year for the probes.
+
+forms<year>.csv and <year>/reachability/resolution.csv are parsed once into a
+YearIndex: the rows of both files plus the (model, exam) -> ids groups and the
+year-stripped modality lookup the probes work on. The index is pickled under
+cache/ keyed by the fingerprint (size, mtime, sha256 when the mtime moved but
+the size did not) of both files and of this module, so a rerun on unchanged
+inputs skips parsing, and an edit of YearIndex rebuilds the index even if
+CACHE_VERSION was not bumped. A cache file that does not unpickle (e.g. after
+YearIndex moved) is rebuilt too.
+
+Paths default to the repository layout (horacle/conv, website), for any year.
+"""
+import csv
+import hashlib
+import os
+import pickle
+import re
+import sys
+from collections import Counter, defaultdict
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO)
+from fileCache import fingerprint, lookup
+
+CACHE = os.path.join(REPO, "cache", "probes")
+CACHE_VERSION = 1
+SOURCE = os.path.abspath(__file__)
+
+YEAR = re.compile(r"-(?:19|20)\d\d-(\d\d)$")
+
+
+def strip_year(key):
+    """ARMCacheCoherence-...-ReachabilityCardinality-2025-00 -> ...-00"""
+    return YEAR.sub(r"-\1", key)
+
+
+def forms_path(year):
+    return os.path.join(REPO, "horacle", "conv", f"forms{year}.csv")
+
+
+def resolution_path(year):
+    return os.path.join(REPO, "website", str(year), "reachability", "resolution.csv")
+
+
+class YearIndex:
+    """Parsed rows and indexes of one forms/resolution pair."""
+
+    def __init__(self, forms, resolution):
+        self.forms, self.resolution = forms, resolution
+
+        self.forms_rows = []                 # (key, modality), line order
+        self.forms_groups = defaultdict(list)  # (model, exam) -> query ids, duplicates kept
+        self.modality = {}                   # year-stripped key -> modality, last line wins
+        self.forms_dup = Counter()           # year-stripped key -> lines
+        with open(forms) as f:
+            for line in f:
+                key, mod = line.split()[:2]
+                self.forms_rows.append((key, mod))
+                model, exam, qid = key.rsplit("-", 2)
+                self.forms_groups[(model, exam)].append(qid)
+                stripped = strip_year(key)
+                self.modality[stripped] = mod
+                self.forms_dup[stripped] += 1
+
+        self.reso_rows = []                  # (model, exam, id, consensus), file order
+        self.reso_groups = defaultdict(list)   # (model, exam) -> ids, duplicates kept
+        with open(resolution) as f:
+            for row in csv.DictReader(f):
+                model = f"{row['ModelFamily']}-{row['ModelType']}-{row['ModelInstance']}"
+                self.reso_rows.append((model, row["Examination"], row["ID"], row["Consensus"].strip().upper()))
+                self.reso_groups[(model, row["Examination"])].append(row["ID"])
+
+    def forms_sets(self):
+        return {k: set(ids) for k, ids in self.forms_groups.items()}
+
+    def reso_sets(self):
+        return {k: set(ids) for k, ids in self.reso_groups.items()}
+
+
+def load_index(year=None, forms=None, resolution=None, cache=CACHE):
+    """YearIndex of a year (or of explicit files), from the cache when both files are unchanged."""
+    forms = os.path.abspath(forms or forms_path(year))
+    resolution = os.path.abspath(resolution or resolution_path(year))
+    path = None
+    if cache:
+        name = hashlib.sha256(f"{forms}\0{resolution}".encode()).hexdigest()[:16]
+        path = os.path.join(cache, f"index-{year or 'files'}-{name}.pickle")
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            if (entry["version"] == CACHE_VERSION and lookup(entry["source"], SOURCE, os.stat(SOURCE))
+                    and lookup(entry["forms"], forms, os.stat(forms))
+                    and lookup(entry["resolution"], resolution, os.stat(resolution))):
+                return entry["index"]
+        except Exception:
+            # missing, truncated, or pickled from another version of this module: rebuilt
+            pass
+
+    index = YearIndex(forms, resolution)
+    if path:
+        os.makedirs(cache, exist_ok=True)
+        entry = {"version": CACHE_VERSION, "source": fingerprint(SOURCE), "forms": fingerprint(forms),
+                 "resolution": fingerprint(resolution), "index": index}
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    return index
+
+
+def add_arguments(ap, year=2025):
+    """The input flags shared by the probes."""
+    ap.add_argument("-year", type=int, default=year, help=f"year of the inputs (default {year})")
+    ap.add_argument("-forms", help="forms<year>.csv (default: horacle/conv/forms<year>.csv)")
+    ap.add_argument("-resolution",
+                    help="resolution.csv (default: website/<year>/reachability/resolution.csv)")
+    ap.add_argument("-cache", default=CACHE, help="index cache folder ('' to disable)")
+
+
+def index_from_args(args):
+    return load_index(args.year, args.forms, args.resolution, args.cache)
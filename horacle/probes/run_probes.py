@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Run several forms/resolution probes of a year in one process.
+
+The year's index (probe_index.py) is loaded once, from its cache when the
+inputs did not change, and every named probe runs against it.
+
+Usage: python3 horacle/probes/run_probes.py [-year 2025] [probe ...]
+"""
+import argparse
+import importlib
+import sys
+import time
+
+from probe_index import add_arguments, index_from_args
+
+PROBES = ["coverage", "models_diff_2025", "querydiff_2025", "show_unmatched_2025", "check_iscex_2025"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Run forms/resolution probes against one shared index.")
+    ap.add_argument("probes", nargs="*", default=PROBES,
+                    help=f"probes to run, in order (default: all of {', '.join(PROBES)})")
+    add_arguments(ap)
+    args = ap.parse_args()
+    unknown = [name for name in args.probes if name not in PROBES]
+    if unknown:
+        ap.error(f"unknown probes: {', '.join(unknown)}")
+
+    start_time = time.time()
+    index = index_from_args(args)
+    sys.stderr.write(f"Loaded the {args.year} index in {time.time() - start_time:.2f} seconds.\n")
+    for name in args.probes:
+        print(f"##### {name}")
+        importlib.import_module(name).run(index)
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Streaming HTML tables.
+
+The table is written to the open output file one row at a time, straight from
+a csv.reader, so a resolution table of tens of thousands of rows never sits in
+memory (as a DataFrame, a list of rows or an HTML string). Cells are written
+as they appear in the CSV, without escaping, as the pages always did.
+
+Large tables can instead be written as JSON shards of SHARD_ROWS rows, read
+by the page with DataTables' ajax option (see buildHTMLFromCSV.py). A shard is
+column oriented: {"rows": n, "columns": [...]}, where a column is the list of
+its cells (numbers for integer columns) or, when it repeats few values,
+{"values": [...], "codes": [...]}.
+"""
+import csv
+import json
+import os
+import shutil
+from itertools import islice
+from multiprocessing import Pool
+
+SHARD_ROWS = 20000
+CATEGORIES = ['state_space', 'global_properties', 'reachability', 'ctl', 'ltl', 'upper_bounds']
+
+
+def html_row(cells, tag='td', classes=None):
+    if classes is None:
+        inner = ''.join(f'    <{tag}>{cell}</{tag}>\n' for cell in cells)
+    else:
+        inner = ''.join(f'    <{tag} class="{c}">{cell}</{tag}>\n' for c, cell in zip(classes, cells))
+    return '  <tr>\n' + inner + '  </tr>\n'
+
+
+def write_table(out, header, rows, attributes='', classes=None, sections=False):
+    """Write header and the rows (any iterable) to out as a <table>.
+
+    attributes is inserted in the opening tag (e.g. ' id="myTable"'), classes
+    are the header cell classes, and sections wraps the header and the rows in
+    <thead>/<tbody>, as DataTables needs.
+    """
+    out.write(f'<table{attributes}>\n')
+    if sections:
+        out.write('<thead>\n')
+    out.write(html_row(header, 'th', classes))
+    if sections:
+        out.write('</thead>\n<tbody>\n')
+    for row in rows:
+        out.write(html_row(row))
+    if sections:
+        out.write('</tbody>\n')
+    out.write('</table>')
+
+
+def write_csv_table(csv_file, out, **kwargs):
+    """Stream a CSV file as an HTML table; returns its header."""
+    with open(csv_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        classes = kwargs.pop('classes', None)
+        if callable(classes):
+            classes = classes(header)
+        write_table(out, header, reader, classes=classes, **kwargs)
+    return header
+
+
+def encode_column(cells):
+    # columns of plain integers (not "01") are written as numbers
+    if all(cell.isdigit() and (cell[0] != '0' or cell == '0') for cell in cells):
+        return [int(cell) for cell in cells]
+    values = {}
+    codes = [values.setdefault(cell, len(values)) for cell in cells]
+    if len(values) * 4 > len(cells):
+        return list(cells)
+    return {'values': list(values), 'codes': codes}
+
+
+def write_json_shards(rows, folder, shard_rows=SHARD_ROWS):
+    """Write the rows (any iterable) as folder/<n>.json shards; returns the shard names."""
+    shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(folder)
+    names = []
+    rows = iter(rows)
+    while True:
+        shard = list(islice(rows, shard_rows))
+        if not shard:
+            return names
+        names.append(f'{len(names)}.json')
+        data = {'rows': len(shard), 'columns': [encode_column(column) for column in zip(*shard)]}
+        with open(os.path.join(folder, names[-1]), 'w') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+
+
+def expand_folders(paths):
+    """Folders to process: a year folder (or the website folder) stands for its category folders."""
+    folders = []
+    for path in paths:
+        categories = [os.path.join(path, c) for c in CATEGORIES if os.path.isdir(os.path.join(path, c))]
+        years = sorted(os.path.join(path, d) for d in os.listdir(path) if d.isdigit() and os.path.isdir(os.path.join(path, d)))
+        if categories:
+            folders += categories
+        elif years:
+            folders += expand_folders(years)
+        else:
+            folders.append(path)
+    return folders
+
+
+def run_all(function, tasks, jobs=1):
+    """function over the tasks, on jobs processes (0 = all cores); returns the results."""
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        return [function(task) for task in tasks]
+    with Pool(min(jobs, len(tasks))) as pool:
+        return pool.map(function, tasks, chunksize=1)
@@ -0,0 +1,241 @@
+"""Vectorized ingestion of the MCC raw-result-analysis.csv.
+
+Python port of the ingestion half of buildRefinedResults.R: split the
+flags:bonus:scores:mask field, explode the results and mask strings into one
+row per (Tool, Input, Examination, ID) with a known verdict, and append the
+BVT rows. The strings are split with whole-column operations and exploded
+through numpy character matrices, instead of per-row lapply/handle_mask calls
+followed by two pivot_longer and a left_join.
+
+The long table has the same rows, in the same order, as the R data frame:
+Tool, ModelFamily, ModelType, ModelInstance, Examination, ID, Verdict, Result.
+Tool, the model columns, Examination and Verdict are categoricals, ID is the
+1-based query number (an integer here, a string in R).
+
+The input is the CSV, its .zip / .tar.gz archive, or a year folder of the
+archiveCache.py cache; archives are read as a stream, never unpacked to disk.
+
+Usage: python3 ingestResults.py [raw-result-analysis.csv] [-o refined-result-bvt.csv]
+                                [-models models.csv] [-store refined]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from archiveCache import open_raw
+from runReport import record
+
+LONG_COLUMNS = ['Tool', 'ModelFamily', 'ModelType', 'ModelInstance', 'Examination', 'ID', 'Verdict', 'Result']
+MODEL_COLUMNS = ['ModelFamily', 'ModelType', 'ModelInstance']
+
+
+def read_raw(source):
+    """Load the raw CSV (a file object, or a path to the CSV or its archive) with normalized column names."""
+    if isinstance(source, str):
+        with open_raw(source) as f:
+            return read_raw(f)
+    return normalize_raw(pd.read_csv(source, dtype=str, keep_default_na=False, na_filter=False))
+
+
+def read_raw_chunks(source, rows):
+    """read_raw, rows lines at a time."""
+    if isinstance(source, str):
+        with open_raw(source) as f:
+            yield from read_raw_chunks(f, rows)
+        return
+    for chunk in pd.read_csv(source, dtype=str, keep_default_na=False, na_filter=False, chunksize=rows):
+        yield normalize_raw(chunk)
+
+
+def normalize_raw(raw):
+    """The used columns of the raw table (or of a chunk of it), under normalized names."""
+    # the header is "# tool,...,flags:bonus:scores:mask,results"; R mangles both names
+    mask_col = next(c for c in raw.columns if 'mask' in c)
+    raw = raw.rename(columns={raw.columns[0]: 'tool', mask_col: 'mask'})
+    # Just for 2019 where ReachabilityDeadlock was renamed.
+    raw.loc[raw['Examination'] == 'GlobalProperties', 'Examination'] = 'ReachabilityDeadlock'
+    # only the mask part of flags:bonus:scores:mask is used downstream
+    raw['mask'] = raw['mask'].str.split(':').str[3]
+    return raw[['tool', 'Input', 'Examination', 'mask', 'results']]
+
+
+def split_models(inputs):
+    """ModelFamily/ModelType/ModelInstance of an Input column, like tidyr::separate."""
+    parts = inputs.str.split('-', expand=True).reindex(columns=range(3))
+    parts.columns = MODEL_COLUMNS
+    return parts
+
+
+def models_table(raw):
+    """Unique models of the year (taken before the BVT and S_ filtering, as in R)."""
+    return split_models(pd.Series(raw['Input'].unique())).drop_duplicates().reset_index(drop=True)
+
+
+def char_matrix(strings, width):
+    """One column per character, truncated or padded with '' to width."""
+    fixed = np.array(strings.str.slice(0, width).tolist(), dtype=f'U{max(width, 1)}')
+    return fixed.view('U1').reshape(len(fixed), max(width, 1))[:, :width]
+
+
+def known(chars):
+    """Characters of a mask that carry a verdict."""
+    return (chars != '') & (chars != '?') & (chars != '-') & (chars != ' ')
+
+
+def mask_width(masks):
+    """Number of known verdicts in the widest mask."""
+    chars = char_matrix(masks, int(masks.str.len().max()))
+    return int(known(chars).sum(axis=1).max())
+
+
+def explode(raw, width=None):
+    """One row per (tool, Input, Examination, ID) whose mask character is known."""
+    if width is None:
+        width = mask_width(raw['mask'])
+    n = len(raw)
+
+    truncated = int((raw['mask'].str.len() > width).sum())
+    if truncated:
+        sys.stderr.write(f"Warning: {truncated} masks wider than {width}, truncated.\n")
+    mask = char_matrix(raw['mask'], width)
+    valid = known(mask)
+
+    # a row joins the mask of every row sharing its (tool, Input, Examination), like the
+    # R left_join; keys are unique in practice, so this is usually the identity
+    keys = ['tool', 'Input', 'Examination']
+    dup = raw.duplicated(keys, keep=False).to_numpy()
+    if dup.any():
+        d = raw.loc[dup, keys].reset_index(drop=False)
+        pairs = d.merge(d, on=keys).sort_values(['index_x', 'index_y'], kind='stable')
+        single = np.flatnonzero(~dup)
+        pr = np.concatenate([single, pairs['index_x'].to_numpy()])
+        pq = np.concatenate([single, pairs['index_y'].to_numpy()])
+        order = np.argsort(pr, kind='stable')
+        pr, pq = pr[order], pq[order]
+    else:
+        pr = pq = np.arange(n)
+
+    pair, col = np.nonzero(valid[pq])
+    if dup.any():
+        # pivot_longer order is (row, ID), then the matched rows in order
+        order = np.lexsort((col, pr[pair]))
+        pair, col = pair[order], col[order]
+    rows, masks = pr[pair], pq[pair]
+
+    # results are either a T/F/? string (one value per character) or space separated values
+    results = raw['results']
+    unknown = results.isin(['?', '']).to_numpy()
+    is_tf = results.str.fullmatch(r'[TF?]+').to_numpy() & ~unknown
+    is_sp = ~is_tf & ~unknown
+    position = np.zeros(n, dtype=np.int64)
+    position[is_tf] = np.arange(is_tf.sum())
+    position[is_sp] = np.arange(is_sp.sum())
+
+    value = np.full(len(rows), None, dtype=object)
+    sel = is_tf[rows]
+    if sel.any():
+        chars = char_matrix(results[is_tf], width)[position[rows[sel]], col[sel]]
+        value[sel] = np.where(chars == '', None, chars)
+    sel = is_sp[rows]
+    if sel.any():
+        # strsplit in R drops a single trailing empty field
+        spaced = results[is_sp]
+        spaced = spaced.where(~spaced.str.endswith(' '), spaced.str.slice(0, -1))
+        tokens = spaced.str.split(' ', expand=True).reindex(columns=range(width)).to_numpy(dtype=object)
+        value[sel] = tokens[position[rows[sel]], col[sel]]
+    value = pd.Series(value, dtype=object)
+    value = value.mask(value.eq('NA') | ((col == 0) & value.isin(['DNF', 'DNC'])))
+
+    tool_codes, tools = pd.factorize(raw['tool'])
+    if 'BVT' not in tools:
+        tools = tools.append(pd.Index(['BVT']))
+    input_codes, inputs = pd.factorize(raw['Input'])
+    exam_codes, exams = pd.factorize(raw['Examination'])
+    models = split_models(pd.Series(inputs))
+
+    long = pd.DataFrame({'Tool': pd.Categorical.from_codes(tool_codes[rows], tools)})
+    for column in MODEL_COLUMNS:
+        codes, uniques = pd.factorize(models[column])
+        long[column] = pd.Categorical.from_codes(codes[input_codes[rows]], uniques)
+    long['Examination'] = pd.Categorical.from_codes(exam_codes[rows], exams)
+    long['ID'] = (col + 1).astype(np.int16)
+    long['Verdict'] = pd.Categorical(mask[masks, col])
+    long['Result'] = value.to_numpy()
+    return long
+
+
+def add_bvt(long):
+    """Append the virtual best tool: one row per distinct correct answer."""
+    bvt = long[long['Verdict'] == 'T'].assign(Tool='BVT')
+    bvt = bvt.drop_duplicates()
+    if len(bvt.drop(columns='Result').drop_duplicates()) != len(bvt):
+        print("Warning: Number of unique rows differs when ignoring 'Result'")
+    bvt['Tool'] = pd.Categorical(bvt['Tool'], categories=long['Tool'].cat.categories)
+    return pd.concat([long, bvt], ignore_index=True)
+
+
+def contest_rows(raw):
+    """Rows of the real tools on the contest models, renumbered from 0."""
+    # BVT rows are recomputed; S_ models are the "Stripped" models of early editions
+    raw = raw[~raw['tool'].str.startswith('BVT') & ~raw['Input'].str.startswith('S_')]
+    return raw.reset_index(drop=True)
+
+
+def refine(source):
+    """The long table with BVT rows, and the models table, of one raw CSV."""
+    raw = read_raw(source)
+    models = models_table(raw)
+    return add_bvt(explode(contest_rows(raw))), models
+
+
+def r_field(values):
+    """write.csv text of a column; each distinct value is formatted only once."""
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        text = uniques.astype(str)
+    else:
+        text = '"' + uniques.astype(str).str.replace('"', '""', regex=False) + '"'
+    # code -1 (NA) picks the trailing NA
+    return np.append(text.to_numpy(dtype=object), 'NA')[codes]
+
+
+def write_csv_r(df, path):
+    """Write like R's write.csv(row.names = FALSE): quoted strings, bare numbers and NA."""
+    header = ','.join(f'"{c}"' for c in df.columns)
+    with open(path, 'w') as f:
+        f.write(header + '\n')
+        if len(df):
+            lines = r_field(df[df.columns[0]])
+            for column in df.columns[1:]:
+                lines = lines + ',' + r_field(df[column])
+            f.write('\n'.join(lines) + '\n')
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Explode raw-result-analysis.csv into the long refined table.")
+    ap.add_argument('input', nargs='?', default='raw-result-analysis.csv', help="CSV, .zip/.tar.gz archive or cache folder")
+    ap.add_argument('-o', help="write the long table with BVT rows (refined-result-bvt.csv)")
+    ap.add_argument('-models', help="write the unique models (models.csv)")
+    ap.add_argument('-store', help="write the long table as a columnar store directory (see resultStore.py)")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    long, models = refine(args.input)
+    print(f"Ingested {args.input}: {len(long)} rows, {len(models)} models in {time.time() - start_time:.2f} seconds.")
+    record('ingest', rows_out=len(long), models=len(models), seconds=time.time() - start_time)
+
+    if args.o:
+        write_csv_r(long.assign(ID=long['ID'].astype(str)), args.o)
+    if args.models:
+        write_csv_r(models, args.models)
+    if args.store:
+        from resultStore import write_store
+        write_store(long, args.store)
+
+
+if __name__ == "__main__":
+    main()
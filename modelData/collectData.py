@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Reproduce ModelDescriptions.csv (the output of collectData.sh) in Python.
+
+For every per-model `<model>.tgz` archive of the INPUTS folder, count the
+places, transitions and arcs of <model>/model.pnml and emit one line:
+
+    <model>,<places>,<transitions>,<arcs>
+
+- model.pnml is read *directly from the archive* and streamed through expat
+  once, counting the three kinds together: nothing is extracted to disk, and
+  memory does not grow with the size of the net.
+- counts are those of collectData.sh's xmlstarlet queries
+  count(_:pnml/_:net/_:page/_:place), etc.: elements in the namespace of the
+  root, directly under a top level page (nested pages are not counted).
+  An archive without model.pnml gives empty counts, as xmlstarlet does.
+- with -j N the archives are spread over N worker processes; rows are written
+  in the order of the shell's `*.tgz` glob (en_US collation: case and
+  punctuation only break ties), so the output does not depend on -j.
+- with -cache FILE, the counts of every archive are kept in a JSON cache keyed
+  by the archive's size/mtime (and sha256 when the mtime moved but the size did
+  not), so a rerun only opens the archives that changed.
+
+Usage: python3 collectData.py [-inputs INPUTS] [-o ModelDescriptions.csv] [-j N] [-cache FILE]
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import tarfile
+import time
+import xml.parsers.expat
+
+# fileCache.py is at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from fileCache import digest, load_cache, lookup, save_cache
+
+KINDS = ["place", "transition", "arc"]
+CACHE_VERSION = 1
+CHUNK = 1 << 20
+
+
+def count_elements(fileobj):
+    """[places, transitions, arcs] of one PNML stream; depth 1 is <pnml>,
+    2 a <net>, 3 a <page>, 4 the counted elements."""
+    counts = [0, 0, 0]
+    path = []  # local names of the open elements, None outside the root namespace
+    ns = []
+
+    def start(name, attrs):
+        uri, _, tag = name.rpartition("}")
+        if not path:
+            ns.append(uri)
+        local = tag if uri == ns[0] else None
+        if len(path) == 3 and path == ["pnml", "net", "page"] and local in KINDS:
+            counts[KINDS.index(local)] += 1
+        path.append(local)
+
+    def end(name):
+        path.pop()
+
+    parser = xml.parsers.expat.ParserCreate(namespace_separator="}")
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    for block in iter(lambda: fileobj.read(CHUNK), b""):
+        parser.Parse(block, False)
+    parser.Parse(b"", True)
+    return counts
+
+
+def process_archive(path):
+    """Counts of one <model>.tgz, None without model.pnml (pool worker)."""
+    model = os.path.basename(path)[:-4]
+    with tarfile.open(path) as tar:
+        try:
+            f = tar.extractfile(f"{model}/model.pnml")
+        except KeyError:
+            f = None
+        if f is None:
+            return None
+        try:
+            return count_elements(f)
+        except xml.parsers.expat.ExpatError as e:
+            sys.stderr.write(f"{model}: {e}\n")
+            return None
+
+
+def scan_archive(path):
+    """process_archive plus the archive's digest, for the cache (pool worker)."""
+    return process_archive(path), digest(path)
+
+
+def glob_order(name):
+    """Sort key of bash's *.tgz expansion under en_US: letters and digits first, case-insensitively."""
+    return re.sub(r"[^0-9a-z]", "", name.lower()), name.swapcase()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-inputs", default=".", help="folder of per-model <model>.tgz (default: current folder)")
+    ap.add_argument("-o", default="ModelDescriptions.csv", help="output file (- for stdout)")
+    ap.add_argument("-j", type=int, default=1,
+                    help="worker processes (default 1 = serial, 0 = all cores)")
+    ap.add_argument("-cache", help="per-archive JSON cache; only changed archives are re-read")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    names = sorted((fn for fn in os.listdir(args.inputs) if fn.endswith(".tgz")), key=glob_order)
+    jobs = args.j or os.cpu_count() or 1
+
+    cached = load_cache(args.cache, CACHE_VERSION) if args.cache else {}
+    archives, todo = {}, []
+    for fn in names:
+        path = os.path.join(args.inputs, fn)
+        st = os.stat(path)
+        entry = cached.get(fn)
+        if args.cache and lookup(entry, path, st):
+            archives[fn] = entry
+        else:
+            archives[fn] = {"size": st.st_size, "mtime": st.st_mtime_ns}
+            todo.append(fn)
+
+    worker = scan_archive if args.cache else process_archive
+    todo_paths = [os.path.join(args.inputs, fn) for fn in todo]
+    if jobs == 1:
+        results = map(worker, todo_paths)
+    else:
+        pool = multiprocessing.Pool(jobs)
+        # imap keeps the archive order; one archive per task, so a large net does not hold back a batch
+        results = pool.imap(worker, todo_paths, chunksize=1)
+    for fn, result in zip(todo, results):
+        if args.cache:
+            result, archives[fn]["sha256"] = result
+        archives[fn]["counts"] = result
+    if jobs != 1:
+        pool.close()
+        pool.join()
+
+    if args.cache:
+        save_cache(args.cache, archives, CACHE_VERSION)
+        sys.stderr.write(f"cache: {len(names) - len(todo)} hits, {len(todo)} misses, "
+                         f"{len(set(cached) - set(archives))} dropped\n")
+
+    fh = sys.stdout if args.o == "-" else open(args.o, "w")
+    fh.write("Model,Places,Transitions,Arcs\n")
+    for fn in names:
+        counts = archives[fn]["counts"]
+        fh.write(",".join([fn[:-4]] + (["", "", ""] if counts is None else [str(c) for c in counts])) + "\n")
+    if fh is not sys.stdout:
+        fh.close()
+
+    sys.stderr.write(f"Processed {len(names)} models in {time.time() - start_time:.2f} seconds.\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""FormulaType and Nupn annotation of the resolution tables.
+
+It replaces fuseFormulaType.R. The annotation files are loaded once per run
+(horacle/conv/iscex<year>.csv, nupn/nupn.csv) into hashed key -> value lookups,
+FormulaType comes from a table of rules applied per Examination, and
+buildCategories.py annotates each resolution table in memory, before it
+writes it. Run standalone, this script annotates written resolution.csv
+files in place, as the R script did.
+
+As the R script did (through readr), a Consensus column holding only logical
+values is rewritten TRUE / FALSE, and the annotated file is written without
+quotes; other Consensus values are kept as they are.
+
+Usage: python3 queryAnnotations.py [-iscex iscex.csv] [-nupn nupn.csv] [category folder ...]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ['ModelFamily', 'ModelType', 'ModelInstance', 'Examination', 'ID']
+
+# FormulaType of a TRUE and of a FALSE consensus, per Examination; any other is UNKNOWN
+FORMULA_TYPES = {
+    'ReachabilityDeadlock': ('CEX', 'INV'),
+    'OneSafe': ('INV', 'CEX'),
+    'StableMarking': ('INV', 'CEX'),
+    'QuasiLiveness': ('INV', 'CEX'),
+    'Liveness': ('INV', 'CEX'),
+}
+# every Examination containing LTL
+LTL_TYPES = ('INV', 'CEX')
+
+# (isNUPN, isGenNUPN) -> Nupn; other combinations are ERROR, models without a line NONE
+NUPN_TYPES = {
+    ('FALSE', 'FALSE'): 'NONE',
+    ('FALSE', 'TRUE'): 'GEN',
+    ('TRUE', 'FALSE'): 'NUPN',
+}
+
+# values readr reads as logical
+LOGICAL = {'T': 'TRUE', 'TRUE': 'TRUE', 'True': 'TRUE', 'true': 'TRUE',
+           'F': 'FALSE', 'FALSE': 'FALSE', 'False': 'FALSE', 'false': 'FALSE'}
+
+
+def as_logical(values):
+    """TRUE / FALSE text of a column if readr would read it as logical, None otherwise."""
+    values = pd.Series(values, dtype=object)
+    present = values.dropna()
+    if present.empty or not present.isin(LOGICAL.keys()).all():
+        return None
+    return values.map(LOGICAL)
+
+
+def keys(df, columns):
+    """"-" joined key of each row, as the columns are joined on."""
+    parts = [df[col].astype(object).where(df[col].notna(), 'NA').astype(str) for col in columns]
+    key = parts[0]
+    for part in parts[1:]:
+        key = key + '-' + part
+    return key
+
+
+def split_keys(values, count):
+    """The first count "-" separated pieces, joined back (tidyr::separate drops the extra ones)."""
+    parts = values.str.split('-', expand=True).reindex(columns=range(count))
+    joined = keys(parts, list(range(count)))
+    return joined[parts.notna().all(axis=1)]
+
+
+def read_iscex(path):
+    """FormulaType by <model>-<Examination>-<ID> key."""
+    forms = pd.read_csv(path, sep=' ', header=None, names=['Key', 'FormulaType'], dtype=str,
+                        keep_default_na=False, na_values=['', 'NA'])
+    key = split_keys(forms['Key'], len(KEY_COLUMNS))
+    lookup = pd.Series(forms['FormulaType'].loc[key.index].to_numpy(), index=key.to_numpy())
+    return lookup[~lookup.index.duplicated()]
+
+
+def read_nupn(path):
+    """Nupn by <model> key."""
+    nupn = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=['', 'NA'])
+    flags = [nupn[col].map(LOGICAL) if as_logical(nupn[col]) is not None else nupn[col]
+             for col in ('isNUPN', 'isGenNUPN')]
+    values = pd.Series([NUPN_TYPES.get(pair, 'ERROR') for pair in zip(*flags)], index=nupn.index, dtype=object)
+    key = split_keys(nupn['model'], 3)
+    lookup = pd.Series(values.loc[key.index].to_numpy(), index=key.to_numpy())
+    return lookup[~lookup.index.duplicated()]
+
+
+class Annotations:
+    """The lookups of a year; a missing file annotates nothing, as in the R script."""
+
+    def __init__(self, iscex=None, nupn=None):
+        self.formula_types = read_iscex(iscex) if iscex and os.path.exists(iscex) else pd.Series(dtype=object)
+        self.nupn = read_nupn(nupn) if nupn and os.path.exists(nupn) else pd.Series(dtype=object)
+
+    def formula_type(self, resolution, consensus):
+        """Rule based FormulaType, overridden by the iscex file."""
+        examination = resolution['Examination'].astype(object)
+        rules = {exam: FORMULA_TYPES.get(exam, LTL_TYPES if 'LTL' in str(exam) else ('UNKNOWN', 'UNKNOWN'))
+                 for exam in pd.unique(examination)}
+        true_type = examination.map({exam: rule[0] for exam, rule in rules.items()}).to_numpy()
+        false_type = examination.map({exam: rule[1] for exam, rule in rules.items()}).to_numpy()
+        ruled = np.where(consensus == 'TRUE', true_type, np.where(consensus == 'FALSE', false_type, 'UNKNOWN'))
+        found = self.formula_types.reindex(keys(resolution, KEY_COLUMNS).to_numpy()).to_numpy()
+        return np.where(pd.notna(found), found, ruled)
+
+    def annotate(self, resolution):
+        """resolution with the Nupn and FormulaType columns (Consensus as readr would write it)."""
+        resolution = resolution.copy()
+        logical = as_logical(resolution['Consensus'])
+        consensus = (resolution['Consensus'] if logical is None else logical).astype(object).to_numpy()
+        if logical is not None:
+            resolution['Consensus'] = logical.to_numpy()
+        formula_type = self.formula_type(resolution, consensus)
+        nupn = self.nupn.reindex(keys(resolution, KEY_COLUMNS[:3]).to_numpy()).to_numpy()
+        resolution['Nupn'] = np.where(pd.notna(nupn), nupn, 'NONE')
+        resolution['FormulaType'] = formula_type
+        return resolution
+
+
+def write_annotated(resolution, path):
+    """Write like readr::write_csv: quotes only where needed, NA for missing values."""
+    resolution.to_csv(path, index=False, na_rep='NA')
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Add the FormulaType and Nupn columns to resolution.csv files.")
+    ap.add_argument('folders', nargs='*', default=['ctl', 'ltl', 'reachability', 'state_space', 'upper_bounds', 'global_properties'],
+                    help="category folders (default: the six categories of the current folder)")
+    ap.add_argument('-iscex', default='iscex.csv', help="FormulaType of the formulas (default: iscex.csv)")
+    ap.add_argument('-nupn', default='nupn.csv', help="NUPN flags of the models (default: nupn.csv)")
+    args = ap.parse_args()
+
+    annotations = Annotations(args.iscex, args.nupn)
+    for folder in args.folders:
+        start_time = time.time()
+        path = os.path.join(folder, 'resolution.csv')
+        resolution = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=['', 'NA'])
+        write_annotated(annotations.annotate(resolution), path)
+        print(f"Processed {path} in {time.time() - start_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Render every page of the website in one process.
+
+The page builders (buildFinalPages.py, buildJVennPages.py, buildTimePlotPages.py,
+buildHardnessPage.py, buildInvCex.py, buildModelPages.py, buildHardnessPlots.py)
+each expose build(env, folder); here they share one Jinja2 environment over
+the repository templates, whose compiled templates are kept across runs in a
+bytecode cache, instead of one interpreter, one pandas import and one template
+compilation per script and per year. -j renders the pages on several threads.
+A year without its category tables (its pipeline stages failed) is left out.
+
+Usage: python3 renderSite.py [-website website] [-years 2024,2025] [-j N] [-cache .jinja-cache]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+import buildFinalPages
+import buildHardnessPage
+import buildHardnessPlots
+import buildInvCex
+import buildJVennPages
+import buildModelPages
+import buildTimePlotPages
+from runReport import record
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES = os.path.join(REPO, 'templates')
+CACHE = os.path.join(REPO, '.jinja-cache')
+CATEGORIES = ['state_space', 'global_properties', 'reachability', 'ctl', 'ltl', 'upper_bounds']
+
+
+class Renderer:
+    """The shared environments: plain, and autoescaped for the time plot pages."""
+
+    def __init__(self, templates=TEMPLATES, cache=CACHE):
+        os.makedirs(cache, exist_ok=True)
+        loader = FileSystemLoader(templates)
+        # autoescape changes the compiled code: one cache file pattern per environment
+        self.env = Environment(loader=loader, bytecode_cache=FileSystemBytecodeCache(cache))
+        self.escaping_env = buildTimePlotPages.make_environment(
+            templates, bytecode_cache=FileSystemBytecodeCache(cache, '__jinja2_escaped_%s.cache'))
+
+    def pages(self, root, years):
+        """(name, render) of every page group: per year, then cross-year."""
+        pages = []
+        for year in years:
+            folder = os.path.join(root, str(year))
+            pages.append((f'{year}/jvenn', lambda folder=folder: buildJVennPages.build(self.env, folder)))
+            pages.append((f'{year}/final', lambda folder=folder: buildFinalPages.build(self.env, folder)))
+        models = os.path.join(root, 'models')
+        pages += [
+            ('site/timeplots', lambda: buildTimePlotPages.build(self.escaping_env, root)),
+            ('site/hardness', lambda: buildHardnessPage.build(self.env, root)),
+            ('site/invcex', lambda: buildInvCex.build(self.env, root)),
+            ('models/pages', lambda: buildModelPages.build(self.env, models)),
+            ('models/hardness_plots', lambda: buildHardnessPlots.build(self.env, models)),
+        ]
+        return pages
+
+
+def render(pages, jobs=1):
+    """Run the page renders; returns the names of those that failed."""
+    def run(page):
+        name, build = page
+        start_time = time.time()
+        try:
+            build()
+        except Exception as e:
+            print(f"[FAILED] {name}: {e}", flush=True)
+            return name
+        print(f"Rendered {name} in {time.time() - start_time:.2f} seconds.", flush=True)
+        record(name, seconds=time.time() - start_time)
+        return None
+
+    if jobs == 1:
+        results = [run(page) for page in pages]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run, pages))
+    return [name for name in results if name is not None]
+
+
+def year_folders(root):
+    return sorted(int(d) for d in os.listdir(root) if d.isdigit() and os.path.isdir(os.path.join(root, d)))
+
+
+def has_results(root, year):
+    """Whether the year has the category tables its pages are built from."""
+    folder = os.path.join(root, str(year))
+    return all(os.path.isfile(os.path.join(folder, c, name)) for c in CATEGORIES
+               for name in ('resolution.csv', 'tool_index_packed.json', 'scores.html'))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render the per-year and cross-year pages of the website in one process.")
+    ap.add_argument('-website', default='.', help="website folder (default: current folder)")
+    ap.add_argument('-years', help="comma separated years (default: every year folder)")
+    ap.add_argument('-j', type=int, default=1, help="render pages concurrently on N threads (0 = all cores)")
+    ap.add_argument('-cache', default=CACHE, help="Jinja2 bytecode cache folder")
+    args = ap.parse_args()
+
+    root = os.path.abspath(args.website)
+    years = [int(y) for y in args.years.split(',')] if args.years else year_folders(root)
+    missing = [year for year in years if not has_results(root, year)]
+    if missing:
+        print(f"Left out, no results: {', '.join(map(str, missing))}.", flush=True)
+        years = [year for year in years if year not in missing]
+    start_time = time.time()
+    pages = Renderer(cache=args.cache).pages(root, years)
+    failed = render(pages, args.j or os.cpu_count() or 1)
+    print(f"Rendered {len(pages) - len(failed)} page groups in {time.time() - start_time:.2f} seconds.")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
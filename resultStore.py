@@ -0,0 +1,128 @@
+"""Typed columnar store of a year's refined long table.
+
+The long table built by ingestResults.py is written as one directory per year:
+meta.json holds the dictionaries and one <column>.npy per column holds small
+integer codes, so a whole year is memory-mapped instead of re-parsed.
+
+    Tool, Model, Examination, Verdict, Result   dictionary codes (-1 = NA)
+    ID                                           1-based query number
+
+Model is the "<ModelFamily>-<ModelType>-<ModelInstance>" Input name; the three
+model columns are rebuilt from its (small) dictionary when loading, and Result
+comes back as a categorical.
+
+Usage: python3 resultStore.py <store dir>     (prints a summary of the year)
+"""
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingestResults import LONG_COLUMNS, MODEL_COLUMNS, split_models
+
+STORE_VERSION = 1
+DICTIONARY_COLUMNS = ['Tool', 'Model', 'Examination', 'Verdict', 'Result']
+# the codes of a store are valid by construction; pandas >= 2.1 can skip checking them
+SKIP_VALIDATION = {'validate': False} if 'validate' in inspect.signature(pd.Categorical.from_codes).parameters else {}
+
+
+def code_dtype(size):
+    """Smallest signed integer type holding codes 0..size-1 and -1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def encode(values):
+    """(codes, dictionary) of a column, NA coded as -1."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, dictionary = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, dictionary = pd.factorize(values)
+    return codes.astype(code_dtype(len(dictionary))), [str(v) for v in dictionary]
+
+
+def write_store(long, path):
+    """Write the long table as a store directory (replaced atomically)."""
+    # the Input the model parts were split from (split_models), a missing part left out
+    model = long['ModelFamily'].astype(object)
+    for column in MODEL_COLUMNS[1:]:
+        part = long[column].astype(object)
+        model = model.where(part.isna(), model + '-' + part)
+    columns = {'Tool': long['Tool'], 'Model': model, 'Examination': long['Examination'],
+               'Verdict': long['Verdict'], 'Result': long['Result']}
+
+    tmp = path.rstrip('/') + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    meta = {'version': STORE_VERSION, 'rows': len(long), 'dictionaries': {}, 'dtypes': {}}
+    for name, values in columns.items():
+        codes, dictionary = encode(values)
+        np.save(os.path.join(tmp, f'{name}.npy'), codes)
+        meta['dictionaries'][name] = dictionary
+        meta['dtypes'][name] = codes.dtype.name
+    ids = long['ID'].to_numpy().astype(np.int16)
+    np.save(os.path.join(tmp, 'ID.npy'), ids)
+    meta['dtypes']['ID'] = ids.dtype.name
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump(meta, f, separators=(',', ':'))
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp, path)
+
+
+class ResultStore:
+    """A memory-mapped store: codes[column] arrays and their dictionaries."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['version'] != STORE_VERSION:
+            raise ValueError(f"{path}: store version {meta['version']}, expected {STORE_VERSION}")
+        self.path = path
+        self.rows = meta['rows']
+        self.dictionaries = meta['dictionaries']
+        self.codes = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                      for name in DICTIONARY_COLUMNS + ['ID']}
+
+    def categorical(self, name):
+        return pd.Categorical.from_codes(self.codes[name], self.dictionaries[name], **SKIP_VALIDATION)
+
+    def frame(self):
+        """The long table, with the same columns as ingestResults.refine."""
+        models = split_models(pd.Series(self.dictionaries['Model']))
+        model_codes = self.codes['Model']
+        df = pd.DataFrame({'Tool': self.categorical('Tool')})
+        for column in MODEL_COLUMNS:
+            codes, uniques = pd.factorize(models[column])
+            df[column] = pd.Categorical.from_codes(codes[model_codes], uniques, **SKIP_VALIDATION)
+        df['Examination'] = self.categorical('Examination')
+        df['ID'] = np.asarray(self.codes['ID'])
+        df['Verdict'] = self.categorical('Verdict')
+        df['Result'] = self.categorical('Result')
+        return df[LONG_COLUMNS]
+
+
+def load_store(path):
+    """The long table of a store directory."""
+    return ResultStore(path).frame()
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python3 resultStore.py <store dir>")
+        sys.exit(1)
+    start_time = time.time()
+    df = load_store(sys.argv[1])
+    print(f"Loaded {sys.argv[1]}: {len(df)} rows, {df['Tool'].nunique()} tools, "
+          f"{df['Examination'].nunique()} examinations in {time.time() - start_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,593 @@
+"""Parallel driver of the analysis pipeline.
+
+Every step of runAnalysis.sh is a Stage with explicit inputs and outputs
+(paths relative to the website folder, possibly glob patterns, or repository
+files). A stage depends on the stages that last produced one of its inputs,
+so the stages form a dependency graph; independent years and categories then
+run at the same time on a pool of workers. Each year is built in its own website/<year> folder and
+every stage runs with its own working directory, so no two years share files.
+
+Rebuilds are incremental: after a stage succeeds, the fingerprints (sha256) of
+its inputs and outputs are recorded in a state file, and a stage whose inputs,
+definition and outputs are unchanged is skipped. An input produced by another
+stage is fingerprinted as that stage last recorded it, so files rewritten in
+place (resolution.csv) or removed after use (the raw CSV, the copied templates:
+"ephemeral" outputs) do not trigger rebuilds; when a stale stage needs such a
+file again, its producer is rerun first. Editing one template thus only reruns
+the page builders that use it.
+
+A failed stage skips the stages that need its outputs, except the cross-year
+stages, whose per-year inputs are optional: they are built from the years that
+have results, and the run only fails when one of them fails.
+
+Raw results are downloaded once per year into a checksummed cache (see
+archiveCache.py); -offline rebuilds from that cache without network access.
+
+Every run writes a report (logs/report.json, see runReport.py): per stage, the
+wall and CPU time and peak memory of its commands, the rows of its CSV inputs
+and outputs, the bytes it wrote, and the per-category steps of its scripts.
+
+Usage: python3 runPipeline.py [-j N] [-years 2018-2026] [-website website] [-n] [-force [STAGE ...]]
+                              [-cache cache] [-offline] [-report logs/report.json]
+"""
+import argparse
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from archiveCache import RAW, extract_raw, get_archive
+from runReport import REPORT_ENV, REPORT_VERSION, read_steps, run_measured
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+PYTHON = sys.executable
+YEARS = list(range(2018, 2027))
+PAGE_BUILDERS = ['buildJVennPages.py', 'buildFinalPages.py', 'buildTimePlotPages.py', 'buildHardnessPage.py',
+                 'buildInvCex.py', 'buildModelPages.py', 'buildHardnessPlots.py']
+CATEGORY_BUILDERS = ['buildCategories.py', 'queryAnnotations.py', 'ingestResults.py', 'resultStore.py',
+                     'toolMatrix.py', 'toolIndex.py']
+# tables longer than this are written as JSON shards (see buildHTMLFromCSV.py)
+JSON_ROWS = 5000
+CATEGORIES = ['state_space', 'global_properties', 'reachability', 'ctl', 'ltl', 'upper_bounds']
+
+
+def repo(*parts):
+    return os.path.join(REPO, *parts)
+
+
+def python(script, *args):
+    return [PYTHON, repo(script)] + list(args)
+
+
+def rscript(script, *args):
+    return ['Rscript', repo(script)] + list(args)
+
+
+class Stage:
+    """One step: shell commands and/or a Python action, run in cwd (relative to the website folder)."""
+
+    def __init__(self, name, cwd='.', commands=(), action=None, cleanup=None, inputs=(), outputs=(), after=(),
+                 ephemeral=(), always=False, optional=()):
+        self.name = name
+        self.cwd = cwd
+        self.commands = list(commands)
+        self.action = action
+        self.cleanup = cleanup
+        self.inputs = list(inputs) + list(optional)
+        # inputs the stage can do without (the per-year files of the cross-year stages):
+        # their producers failing does not skip it
+        self.optional = set(optional)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        # outputs that later stages delete; their absence does not make the stage stale
+        self.ephemeral = set(ephemeral)
+        # run on every invocation (cleanups)
+        self.always = always
+        self.deps = set()
+        self.soft = set()
+        self.sources = {}
+
+    def key(self):
+        """Fingerprint of the stage definition: a changed command reruns it."""
+        action = getattr(self.action, '__qualname__', None)
+        return hashlib.sha256(repr((self.cwd, self.commands, action, self.outputs)).encode()).hexdigest()
+
+    def run(self, root, log, usage, steps=None):
+        """Run the stage; usage gets the wall time, CPU time and peak RSS of its commands."""
+        cwd = os.path.join(root, self.cwd)
+        os.makedirs(cwd, exist_ok=True)
+        env = dict(os.environ)
+        if steps:
+            env[REPORT_ENV] = steps
+        usage.update(seconds=0.0, cpu=0.0, peak_mb=None)
+        start = time.time()
+        try:
+            if self.action is not None:
+                self.action(cwd)
+            for command in self.commands:
+                log.write(f"+ {' '.join(command)}\n")
+                log.flush()
+                status, _, cpu, peak = run_measured(command, cwd, log, env)
+                usage['cpu'] += cpu
+                usage['peak_mb'] = max(usage['peak_mb'] or 0, peak)
+                if status != 0:
+                    raise subprocess.CalledProcessError(status, command)
+        finally:
+            usage['seconds'] = time.time() - start
+            if self.cleanup is not None:
+                self.cleanup(cwd)
+
+
+class Fingerprints:
+    """sha256 of files, directories and glob patterns, memoized on (size, mtime)."""
+
+    def __init__(self, memo):
+        self.memo = memo
+        self.lock = threading.Lock()
+
+    def file(self, path):
+        st = os.stat(path)
+        with self.lock:
+            known = self.memo.get(path)
+        if known is not None and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        with self.lock:
+            self.memo[path] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def path(self, path):
+        """Digest of a file, a directory tree or a glob pattern; None when absent."""
+        if not glob.has_magic(path) and os.path.isfile(path):
+            return self.file(path)
+        files = expand(path)
+        if not files:
+            return None
+        h = hashlib.sha256()
+        for f in files:
+            h.update(f"{os.path.relpath(f, os.path.dirname(path))}:{self.file(f)}\n".encode())
+        return h.hexdigest()
+
+
+def expand(path):
+    """The files of a file, directory tree or glob pattern."""
+    if glob.has_magic(path):
+        return sorted(glob.glob(path))
+    if os.path.isdir(path):
+        return sorted(os.path.join(d, f) for d, _, names in os.walk(path) for f in names)
+    return [path] if os.path.exists(path) else []
+
+
+def csv_rows(path):
+    """Data rows of a CSV file (lines after the header)."""
+    with open(path, 'rb') as f:
+        lines = sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+    return max(lines - 1, 0)
+
+
+class Pipeline:
+    """Stages in declaration order; the dependencies follow from their inputs and outputs."""
+
+    def __init__(self, root):
+        self.root = root
+        self.stages = {}
+        self.producers = {}
+        self.state = {'stages': {}, 'files': {}}
+        self.fingerprints = Fingerprints(self.state['files'])
+        self.force = set()
+        self.lock = threading.Lock()
+        self.producing = {}
+        self.report = []
+        self.rows = {}
+
+    def add(self, stage):
+        # an input depends on its last producer, so a stage rewriting a file in
+        # place (e.g. the annotation of resolution.csv) is ordered after its writer
+        stage.sources = {i: self.producers[i] for i in stage.inputs if i in self.producers}
+        stage.deps = set(stage.sources.values())
+        stage.deps.update(stage.after)
+        required = {self.producers[i] for i in stage.inputs if i in self.producers and i not in stage.optional}
+        stage.soft = stage.deps - required - set(stage.after)
+        self.stages[stage.name] = stage
+        for o in stage.outputs:
+            self.producers[o] = stage.name
+        return stage
+
+    def load_state(self, path):
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+            self.fingerprints = Fingerprints(self.state['files'])
+
+    def save_state(self, path):
+        with self.lock:
+            data = json.dumps(self.state, separators=(',', ':'))
+        with open(path + '.tmp', 'w') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+
+    def absolute(self, path):
+        return os.path.join(self.root, path)
+
+    def input_fingerprints(self, stage):
+        """Current digest of source inputs, recorded digest for inputs produced by a stage."""
+        digests = {}
+        for i in stage.inputs:
+            if i in stage.sources:
+                record = self.state['stages'].get(stage.sources[i], {})
+                digests[i] = record.get('outputs', {}).get(i)
+            else:
+                digests[i] = self.fingerprints.path(self.absolute(i))
+        return digests
+
+    def up_to_date(self, stage):
+        record = self.state['stages'].get(stage.name)
+        if record is None or stage.always or stage.name in self.force:
+            return False
+        if record['key'] != stage.key() or record['inputs'] != self.input_fingerprints(stage):
+            return False
+        for o, digest in record['outputs'].items():
+            current = self.fingerprints.path(self.absolute(o))
+            if current is None:
+                # missing after the last run as well: an output written for some inputs only
+                # (e.g. the JSON shards of large tables)
+                if digest is not None and o not in stage.ephemeral:
+                    return False
+            elif self.producers.get(o) == stage.name and current != digest:
+                # outputs rewritten by a later stage are checked by that stage
+                return False
+        return True
+
+    def count_rows(self, paths):
+        """Rows of the CSV files among paths, memoized on (size, mtime)."""
+        total = 0
+        for path in paths:
+            for f in expand(self.absolute(path)):
+                if not f.endswith('.csv'):
+                    continue
+                st = os.stat(f)
+                with self.lock:
+                    known = self.rows.get(f)
+                if known is None or known[:2] != (st.st_size, st.st_mtime_ns):
+                    known = (st.st_size, st.st_mtime_ns, csv_rows(f))
+                    with self.lock:
+                        self.rows[f] = known
+                total += known[2]
+        return total
+
+    def add_report(self, stage, status, usage=None, steps=None):
+        """The report entry of a stage: its measures, data sizes and the steps its scripts recorded."""
+        entry = {'name': stage.name, 'year': int(stage.name.split('/')[0]) if stage.name[:4].isdigit() else None,
+                 'status': status, 'seconds': None, 'cpu': None, 'peak_mb': None}
+        if usage:
+            entry.update(seconds=round(usage['seconds'], 3), cpu=round(usage['cpu'], 3), peak_mb=usage['peak_mb'],
+                         rows_in=self.count_rows(stage.inputs), rows_out=self.count_rows(stage.outputs),
+                         bytes_out=sum(os.path.getsize(f) for o in stage.outputs for f in expand(self.absolute(o))),
+                         steps=read_steps(steps) if steps else [])
+        with self.lock:
+            self.report.append(entry)
+
+    def execute(self, stage, logs):
+        """Run stage and record its fingerprints and measures."""
+        inputs = self.input_fingerprints(stage)
+        steps = os.path.join(logs, stage.name.replace('/', '_') + '.steps.jsonl')
+        if os.path.exists(steps):
+            os.remove(steps)
+        usage = {}
+        try:
+            with open(os.path.join(logs, stage.name.replace('/', '_') + '.log'), 'w') as log:
+                stage.run(self.root, log, usage, steps)
+        except Exception:
+            self.add_report(stage, 'failed', usage, steps)
+            raise
+        outputs = {o: self.fingerprints.path(self.absolute(o)) for o in stage.outputs}
+        with self.lock:
+            self.state['stages'][stage.name] = {'key': stage.key(), 'inputs': inputs, 'outputs': outputs}
+        self.add_report(stage, 'done', usage, steps)
+
+    def restore(self, stage, logs):
+        """Rerun the producers of ephemeral inputs that were deleted since."""
+        for i, producer in stage.sources.items():
+            if i in self.stages[producer].ephemeral and self.fingerprints.path(self.absolute(i)) is None:
+                with self.lock:
+                    lock = self.producing.setdefault(producer, threading.Lock())
+                with lock:
+                    if self.fingerprints.path(self.absolute(i)) is None:
+                        self.restore(self.stages[producer], logs)
+                        self.execute(self.stages[producer], logs)
+
+    def run(self, jobs, logs):
+        os.makedirs(logs, exist_ok=True)
+        waiting = {name: set(stage.deps) for name, stage in self.stages.items()}
+        done, failed, skipped = set(), set(), set()
+        running = {}
+
+        def drop(name):
+            # the stages waiting on a failed or skipped stage are skipped, unless it only gives them optional inputs
+            for dependent in [n for n, deps in waiting.items() if name in deps]:
+                if name in self.stages[dependent].soft:
+                    waiting[dependent].discard(name)
+                elif waiting.pop(dependent, None) is not None:
+                    skipped.add(dependent)
+                    self.add_report(self.stages[dependent], 'skipped')
+                    drop(dependent)
+
+        def execute(stage):
+            if self.up_to_date(stage):
+                self.add_report(stage, 'up to date')
+                return None
+            start = time.time()
+            self.restore(stage, logs)
+            self.execute(stage, logs)
+            return time.time() - start
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while waiting or running:
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[pool.submit(execute, self.stages[name])] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        elapsed = future.result()
+                    except Exception as e:
+                        failed.add(name)
+                        print(f"[FAILED] {name}: {e}", flush=True)
+                        drop(name)
+                        continue
+                    done.add(name)
+                    if elapsed is None:
+                        print(f"[up to date] {name}", flush=True)
+                    else:
+                        print(f"[done] {name} in {elapsed:.2f} seconds.", flush=True)
+                    for deps in waiting.values():
+                        deps.discard(name)
+        return done, failed, skipped
+
+    def save_report(self, path, years, jobs, seconds):
+        report = {'version': REPORT_VERSION, 'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  'host': {'python': platform.python_version(), 'platform': platform.platform(),
+                           'cpus': os.cpu_count()},
+                  'years': years, 'jobs': jobs, 'seconds': round(seconds, 3), 'stages': self.report}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=1)
+
+    def show(self):
+        for name, stage in self.stages.items():
+            deps = ', '.join(sorted(stage.deps)) or '-'
+            print(f"{name}  <-  {deps}")
+
+
+def copy_templates(cwd):
+    shutil.copytree(repo('templates'), os.path.join(cwd, 'templates'), dirs_exist_ok=True)
+    shutil.copy(repo('templates', 'styles.css'), cwd)
+
+
+def remove_templates(cwd):
+    shutil.rmtree(os.path.join(cwd, 'templates'), ignore_errors=True)
+
+
+def fetch_archive(year, cache, offline):
+    """Download the year's archive into the cache, unless a valid copy is already there."""
+    return lambda cwd: get_archive(year, cache, offline)
+
+
+def extract(folder):
+    """buildRefinedResults.R reads ./raw-result-analysis.csv: unpack it from the cached archive."""
+    return lambda cwd: extract_raw(folder, os.path.join(cwd, RAW))
+
+
+def remove_raw(cwd):
+    if os.path.exists(os.path.join(cwd, RAW)):
+        os.remove(os.path.join(cwd, RAW))
+
+
+def add_year(p, year, cache, offline=False):
+    y = str(year)
+    archive = os.path.join(cache, y)
+
+    def at(*parts):
+        return os.path.join(y, *parts)
+
+    def per_category(name):
+        return [at(c, name) for c in CATEGORIES]
+
+    resolutions = per_category('resolution.csv')
+    tool_indexes = per_category('tool_index_dict.json')
+
+    p.add(Stage(f'{y}/templates', y, action=copy_templates,
+                inputs=[repo('templates')], outputs=[at('templates'), at('styles.css')]))
+    # always checked, so that a corrupted cache is detected (and fetched again)
+    p.add(Stage(f'{y}/download', y, action=fetch_archive(year, cache, offline), outputs=[archive], always=True))
+    # models.csv, answers.csv and the scores still come from the R script, until their
+    # Python port (buildCategories.py -scores) is checked against its output
+    p.add(Stage(f'{y}/extract', y, action=extract(archive), inputs=[archive], outputs=[at(RAW)], ephemeral=[at(RAW)]))
+    p.add(Stage(f'{y}/refine', y, commands=[rscript('buildRefinedResults.R')],
+                inputs=[at(RAW), repo('buildRefinedResults.R')],
+                outputs=[at('models.csv'), at('answers.csv')] + resolutions + tool_indexes + per_category('scores.csv')))
+    p.add(Stage(f'{y}/cleanup', y, action=remove_raw, after=[f'{y}/refine'], always=True))
+    # typed columnar copy of the refined long table, read straight from the archive
+    p.add(Stage(f'{y}/store', y, commands=[python('ingestResults.py', archive, '-store', 'refined')],
+                inputs=[archive, repo('ingestResults.py'), repo('resultStore.py')], outputs=[at('refined')]))
+    # replaces the resolutions and tool indexes of the R script: annotated in memory
+    # (FormulaType, Nupn) instead of being rewritten, and packed for the Venn pages
+    iscex = repo('horacle', 'conv', f'iscex{year}.csv')
+    p.add(Stage(f'{y}/categories', y,
+                commands=[python('buildCategories.py', '-store', 'refined', '-iscex', iscex, '-nupn', repo('nupn', 'nupn.csv'))],
+                inputs=[at('refined'), iscex, repo('nupn', 'nupn.csv')] + [repo(script) for script in CATEGORY_BUILDERS],
+                outputs=resolutions + tool_indexes + per_category('tool_index_packed.json'), after=[f'{y}/refine']))
+    p.add(Stage(f'{y}/venn_counts', y, commands=[python('buildVennCounts.py')],
+                inputs=resolutions + per_category('tool_index_packed.json')
+                + [repo('buildVennCounts.py'), repo('buildJVennPages.py'), repo('toolMatrix.py')],
+                outputs=per_category('venn_counts.json')))
+    # resolution.html loads its rows from JSON shards; scores.html stays inline (buildFinalPages embeds it)
+    # all categories in one process, one category per core
+    p.add(Stage(f'{y}/html', y, commands=[python('buildHTMLFromCSV.py', '-json', str(JSON_ROWS), '-j', '0', '.')],
+                inputs=resolutions + per_category('scores.csv') + [repo('buildHTMLFromCSV.py'), repo('htmlTable.py')],
+                outputs=per_category('resolution.html') + per_category('resolution_data') + per_category('scores.html')))
+    p.add(Stage(f'{y}/hardness', y, commands=[rscript('plotHardness.R')],
+                inputs=resolutions + [at('models.csv'), repo('plotHardness.R')],
+                outputs=[at(f'{c}ModelEase.png') for c in CATEGORIES + ['Overall']]))
+
+
+def add_cross_year(p, years):
+    def each_year(*parts):
+        return [os.path.join(str(year), *parts) for year in years]
+
+    def per_category(name, ys=years):
+        return [os.path.join(str(year), c, name) for year in ys for c in CATEGORIES]
+
+    p.add(Stage('site/templates', action=copy_templates,
+                inputs=[repo('templates')], outputs=['templates', 'styles.css'], ephemeral=['templates']))
+    # The per-year inputs of the cross-year stages are optional: a year whose stages
+    # failed (e.g. the archive of a year not yet published) is left out of the
+    # cross-year plots and pages, which are built from the years that have results.
+    # generate time plots
+    p.add(Stage('site/annual', commands=[rscript('analyzeAnnual.R')],
+                action=lambda cwd: os.makedirs(os.path.join(cwd, 'csv'), exist_ok=True),
+                inputs=[repo('analyzeAnnual.R')], optional=each_year('answers.csv'), outputs=['csv/*_time.csv']))
+    # generate invcex
+    invcex_years = [year for year in years if year >= 2020]
+    p.add(Stage('site/invcex', commands=[rscript('analyzeINVCEX.R')],
+                inputs=[repo('analyzeINVCEX.R')],
+                optional=per_category('resolution.csv', invcex_years) + per_category('tool_index_dict.json', invcex_years),
+                outputs=['invcex/*.csv']))
+
+    # generate model size plots
+    p.add(Stage('models/setup', 'models',
+                action=lambda cwd: (shutil.copy(repo('modelData', 'ModelDescriptions.csv'), cwd), copy_templates(cwd)),
+                inputs=[repo('modelData', 'ModelDescriptions.csv'), repo('templates')],
+                outputs=['models/ModelDescriptions.csv', 'models/templates', 'models/styles.css'],
+                ephemeral=['models/templates']))
+    p.add(Stage('models/sizes', 'models', commands=[rscript('analyzeSizes.R')],
+                inputs=['models/ModelDescriptions.csv', repo('analyzeSizes.R')], outputs=['models/*.png']))
+    p.add(Stage('models/hardness', 'models', commands=[python('analyzeHardness.py', '-j', '0')],
+                inputs=['models/ModelDescriptions.csv', repo('analyzeHardness.py')],
+                optional=per_category('resolution.csv') + each_year('models.csv'), outputs=['models/ModelHardness.csv']))
+
+    # every Jinja2 page, per year and cross-year, rendered in one process (see renderSite.py)
+    p.add(Stage('site/render', commands=[python('renderSite.py', '-years', ','.join(map(str, years)), '-j', '0')],
+                inputs=['csv/*_time.csv', 'invcex/*.csv', 'models/*.png', 'models/ModelDescriptions.csv', 'models/ModelHardness.csv',
+                        repo('templates'), repo('renderSite.py')] + [repo(script) for script in PAGE_BUILDERS],
+                optional=per_category('resolution.csv') + per_category('tool_index_packed.json') + per_category('scores.html')
+                + each_year('templates') + each_year('OverallModelEase.png'),
+                outputs=per_category('filters.json') + per_category('venn_dynamic.html')
+                + each_year('index.html') + per_category('index.html')
+                + ['timeplots.html', 'PluriAnnual_dynamic.html', 'hardness.html',
+                   'invcex/invcex.html', 'invcex/toolinvcex.html', 'invcex/toolinvcexhard.html',
+                   'models/models.html', 'models/ModelDescriptions.html', 'models/ModelHardness.html',
+                   'models/hardness_plot_rendered.html', 'models/hardness_scores.csv', 'models/hardness_data']))
+    p.add(Stage('site/cleanup', action=remove_templates, after=['site/templates', 'site/render'], always=True))
+    p.add(Stage('models/cleanup', 'models', action=remove_templates, after=['site/render'], always=True))
+
+    p.add(Stage('site/index', action=lambda cwd: write_main_index(cwd, years), outputs=['index.html'],
+                after=['site/render'], always=True))
+
+
+def write_main_index(cwd, years):
+    # only the years whose pages were rendered
+    years = [year for year in years if os.path.exists(os.path.join(cwd, str(year), 'index.html'))]
+    links = ''.join(f'    <li><a href="{year}/index.html">MCC {year} Analysis</a></li>\n' for year in years)
+    with open(os.path.join(cwd, 'index.html'), 'w') as f:
+        f.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Model Checking Contest Analysis</title>
+  <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+  <h1>Model Checking Contest Analysis</h1>
+  <p>Select a year to view the analysis:</p>
+  <ul>
+{links}  <a href="PluriAnnual_dynamic.html">Dynamic Pluriannual plots</a><br/>
+  <a href="models/models.html">Analysis of the Models of MCC</a><br/>
+  <a href="models/hardness_plot_rendered.html">Model Hardness: Dynamic Pluriannual plots</a><br/>
+  <a href="hardness.html">Model Hardness: Static plots</a><br/>
+  <a href="invcex/invcex.html">Analysis of Invariants vs Counter-examples (Formulas)</a><br/>
+  <a href="invcex/toolinvcex.html">Analysis of Invariants vs Counter-examples (Tools)</a><br/>
+  <a href="invcex/toolinvcexhard.html">Analysis of Invariants vs Counter-examples (Tools + Hard)</a><br/>
+</body>
+</html>
+""")
+
+
+def parse_years(text):
+    if '-' in text:
+        first, last = text.split('-')
+        return list(range(int(first), int(last) + 1))
+    return [int(y) for y in text.split(',')]
+
+
+def build_pipeline(root, years, cache, offline=False):
+    p = Pipeline(root)
+    for year in years:
+        add_year(p, year, cache, offline)
+    add_cross_year(p, years)
+    return p
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the analysis website, running independent stages in parallel.")
+    ap.add_argument('-j', type=int, default=0, help="parallel stages (default 0 = all cores)")
+    ap.add_argument('-years', type=parse_years, default=YEARS, help="e.g. 2018-2026 or 2024,2025")
+    ap.add_argument('-website', default='website', help="output folder")
+    ap.add_argument('-logs', default='logs', help="one log file per stage")
+    ap.add_argument('-cache', default='cache', help="downloaded archives, kept across runs (see archiveCache.py)")
+    ap.add_argument('-offline', action='store_true', help="use the cached archives only, never the network")
+    ap.add_argument('-n', action='store_true', help="print the stages and their dependencies, run nothing")
+    ap.add_argument('-state', default='.pipeline-state.json', help="fingerprints of the previous runs")
+    ap.add_argument('-force', nargs='*', metavar='STAGE',
+                    help="rerun these stages (shell patterns, e.g. '2025/*'), or every stage if none given")
+    ap.add_argument('-report', help="measures of the run (default <logs>/report.json, see runReport.py)")
+    args = ap.parse_args()
+
+    root = os.path.abspath(args.website)
+    p = build_pipeline(root, args.years, os.path.abspath(args.cache), args.offline)
+    if args.n:
+        p.show()
+        return
+
+    p.load_state(args.state)
+    if args.force is not None:
+        patterns = args.force or ['*']
+        p.force = {name for name in p.stages if any(fnmatch.fnmatch(name, pat) for pat in patterns)}
+
+    start_time = time.time()
+    jobs = args.j or os.cpu_count() or 1
+    report = args.report or os.path.join(args.logs, 'report.json')
+    try:
+        done, failed, skipped = p.run(jobs, os.path.abspath(args.logs))
+    finally:
+        p.save_state(args.state)
+        p.save_report(report, args.years, jobs, time.time() - start_time)
+    print(f"{len(done)} stages done, {len(failed)} failed, {len(skipped)} skipped "
+          f"in {time.time() - start_time:.2f} seconds (report: {report}).")
+    for name in sorted(failed):
+        print(f"  failed: {name} (see {args.logs}/{name.replace('/', '_')}.log)")
+    # a failed year is left out of the site, which is still deployed; a failed cross-year stage is an error
+    left_out = sorted({name.split('/')[0] for name in failed | skipped if name[:4].isdigit()})
+    if left_out:
+        print(f"Years without complete results: {', '.join(left_out)}.")
+    if any(not name[:4].isdigit() for name in failed | skipped):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
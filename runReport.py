@@ -0,0 +1,176 @@
+"""Per-stage measurements of a pipeline run, and the summary of the run report.
+
+runPipeline.py runs every command of a stage, Python or R, through
+run_measured: its wall time, CPU time and peak resident memory (wait4) go to the
+stage's entry of the run report (logs/report.json), next to the rows of the
+CSV inputs and outputs and the bytes written. While a stage runs,
+PIPELINE_REPORT names a JSON lines file: the Python scripts add one record per
+category or file there (record()), kept as the "steps" of the stage.
+
+    report.json: {"version", "date", "host", "years", "jobs", "seconds",
+                  "stages": [{"name", "year", "status", "seconds", "cpu", "peak_mb",
+                              "rows_in", "rows_out", "bytes_out", "steps": [...]}]}
+
+Run standalone, it shows the slowest stages and steps of a report, the time per
+year and per category, and with -compare the changes since a previous report.
+
+Usage: python3 runReport.py [logs/report.json] [-top 10] [-compare previous.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+REPORT_VERSION = 1
+REPORT_ENV = 'PIPELINE_REPORT'
+
+
+def peak_mb(maxrss):
+    # ru_maxrss is in kB on Linux, in bytes on macOS
+    return round(maxrss / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def run_measured(command, cwd, log, env=None):
+    """Run one command, output to log; (exit code, seconds, cpu seconds, peak MB) of its process."""
+    start = time.time()
+    process = subprocess.Popen(command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT, env=env)
+    # wait4 gives the resource usage of this process alone
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    return process.returncode, time.time() - start, usage.ru_utime + usage.ru_stime, peak_mb(usage.ru_maxrss)
+
+
+def record(step, **fields):
+    """Add a measurement of the current script to the stage's report, if it runs under the pipeline."""
+    path = os.environ.get(REPORT_ENV)
+    if not path:
+        return
+    import resource
+    entry = {'step': step, 'script': os.path.basename(sys.argv[0])}
+    entry.update(fields)
+    if 'seconds' in entry:
+        entry['seconds'] = round(entry['seconds'], 3)
+    entry['peak_mb'] = peak_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    # one short append per record: lines of concurrent workers do not interleave
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def read_steps(path):
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def kind(name):
+    """Stage name without its year: 2025/categories -> */categories."""
+    return re.sub(r'^\d{4}/', '*/', name)
+
+
+def timed(stages):
+    return [s for s in stages if s.get('seconds') is not None]
+
+
+def memory(stage):
+    return '-' if stage['peak_mb'] is None else f"{stage['peak_mb']:.1f}"
+
+
+def show_summary(report, top=10):
+    stages = timed(report['stages'])
+    print(f"Run of {report['date']}: {len(stages)} stages run in {report['seconds']:.2f} seconds "
+          f"({report['jobs']} workers, years {', '.join(map(str, report['years']))}).")
+
+    print("\nSlowest stages:")
+    for s in sorted(stages, key=lambda s: -s['seconds'])[:top]:
+        status = '' if s['status'] == 'done' else f"  [{s['status']}]"
+        print(f"  {s['name']:<28} {s['seconds']:>9.2f} s  cpu {s['cpu']:>9.2f} s  peak {memory(s):>8} MB  "
+              f"rows {s['rows_in']} -> {s['rows_out']}  {s['bytes_out'] / 1e6:.1f} MB written{status}")
+
+    steps = [dict(step, stage=s['name']) for s in stages for step in s.get('steps', []) if 'seconds' in step]
+    if steps:
+        print("\nSlowest steps:")
+        for step in sorted(steps, key=lambda step: -step['seconds'])[:top]:
+            print(f"  {step['stage']:<28} {step['step']:<40} {step['seconds']:>9.2f} s  peak {step['peak_mb']:>8.1f} MB")
+
+    years = {}
+    for s in stages:
+        years[s['year'] or 'cross-year'] = years.get(s['year'] or 'cross-year', 0) + s['seconds']
+    print("\nTime per year:")
+    for year, seconds in sorted(years.items(), key=lambda item: str(item[0])):
+        print(f"  {year:<12} {seconds:>9.2f} s")
+
+    categories = {}
+    for step in steps:
+        if step.get('category'):
+            categories[step['category']] = categories.get(step['category'], 0) + step['seconds']
+    if categories:
+        print("\nTime per category (steps of every year):")
+        for category, seconds in sorted(categories.items(), key=lambda item: -item[1]):
+            print(f"  {category:<20} {seconds:>9.2f} s")
+
+
+def show_comparison(report, previous, threshold=1.2, minimum=0.5):
+    """Stages whose time or memory changed since the previous report, and the totals per kind of stage;
+    stages under minimum seconds in both runs are left out."""
+    old = {s['name']: s for s in timed(previous['stages'])}
+    new = {s['name']: s for s in timed(report['stages'])}
+    print(f"\nCompared with the run of {previous['date']} ({previous['seconds']:.2f} -> {report['seconds']:.2f} s):")
+
+    changed = []
+    for name in sorted(set(old) & set(new)):
+        a, b = old[name], new[name]
+        if max(a['seconds'], b['seconds']) < minimum:
+            continue
+        ratio = b['seconds'] / max(a['seconds'], 1e-3)
+        growth = (b['peak_mb'] or 0) / max(a['peak_mb'] or 0, 1e-3)
+        if ratio >= threshold or ratio <= 1 / threshold or growth >= threshold:
+            changed.append((name, a, b, ratio, growth))
+    for name, a, b, ratio, growth in sorted(changed, key=lambda c: -c[3]):
+        print(f"  {name:<28} {a['seconds']:>9.2f} -> {b['seconds']:>9.2f} s (x{ratio:.2f})  "
+              f"{memory(a):>8} -> {memory(b):>8} MB (x{growth:.2f})")
+    if not changed:
+        print(f"  no stage changed by more than x{threshold}")
+    # stages that were up to date in one of the runs are neither new nor gone
+    for name in sorted(set(new) - {s['name'] for s in previous['stages']}):
+        print(f"  new: {name} {new[name]['seconds']:.2f} s")
+    for name in sorted(set(old) - {s['name'] for s in report['stages']}):
+        print(f"  gone: {name}")
+
+    # a new contest year adds a stage of each kind: their totals show how the pipeline grows
+    totals = {}
+    for index, stages in enumerate((old, new)):
+        for s in stages.values():
+            totals.setdefault(kind(s['name']), [0, 0, 0, 0])
+            totals[kind(s['name'])][index] += s['seconds']
+            totals[kind(s['name'])][index + 2] += 1
+    print("\nTime per kind of stage (stages run):")
+    for name, (a, b, n_a, n_b) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        if max(a, b) >= minimum:
+            print(f"  {name:<28} {a:>9.2f} ({n_a}) -> {b:>9.2f} ({n_b}) s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize a pipeline run report, or compare it with a previous one.")
+    ap.add_argument('report', nargs='?', default=os.path.join('logs', 'report.json'),
+                    help="report of runPipeline.py (default logs/report.json)")
+    ap.add_argument('-top', type=int, default=10, help="number of slowest stages and steps shown (default 10)")
+    ap.add_argument('-compare', help="report of a previous run")
+    ap.add_argument('-threshold', type=float, default=1.2, help="ratio above which a stage is shown as changed")
+    ap.add_argument('-min', type=float, default=0.5, help="leave out stages under this many seconds (default 0.5)")
+    args = ap.parse_args()
+
+    with open(args.report) as f:
+        report = json.load(f)
+    show_summary(report, args.top)
+    if args.compare:
+        with open(args.compare) as f:
+            show_comparison(report, json.load(f), args.threshold, args.min)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Synthetic raw-result-analysis.csv at a configurable scale, for benchmarks.
+
+Writes a year in the format of the MCC archives ("# tool,Input,Examination,
+flags:bonus:scores:mask,results"): for every model, examination and tool a
+mask of T (correct), X (wrong) and ? (no answer) per formula, and the results
+as a T/F string or space separated values (StateSpace, UpperBounds), or
+DNF/DNC for a failed run. Every query has one true value, each tool answers a
+query with a probability given by its strength and the query's difficulty, so
+the consensus, scores and Venn regions have a realistic shape.
+
+The default size is that of a 2025 year (BASE_MODELS models, BASE_TOOLS
+tools, 16 formulas per examination); -scale multiplies the number of models.
+Models are written in chunks, so memory does not grow with the scale, and the
+output only depends on the seed and the size.
+
+Usage: python3 synthResults.py [-scale 10] [-models N] [-tools N] [-formulas 16] [-seed 2025]
+                               [-o raw-result-analysis.csv] [-descriptions ModelDescriptions.csv]
+"""
+import argparse
+import time
+
+import numpy as np
+
+BASE_MODELS = 1600
+BASE_TOOLS = 12
+FORMULAS = 16
+# models per generated chunk
+CHUNK = 200
+
+# examinations, number of formulas (None: -formulas) and whether results are numbers
+EXAMINATIONS = [
+    ("StateSpace", 4, True),
+    ("ReachabilityDeadlock", 1, False), ("Liveness", 1, False), ("QuasiLiveness", 1, False),
+    ("StableMarking", 1, False), ("OneSafe", 1, False),
+    ("ReachabilityCardinality", None, False), ("ReachabilityFireability", None, False),
+    ("CTLCardinality", None, False), ("CTLFireability", None, False),
+    ("LTLCardinality", None, False), ("LTLFireability", None, False),
+    ("UpperBounds", None, True),
+]
+HEADER = "# tool,Input,Examination,flags:bonus:scores:mask,results\n"
+
+# chance that a tool skips an examination, fails a whole run, answers wrongly
+ABSENT = 0.1
+FAILED = 0.05
+WRONG = 0.005
+
+
+def model_names(count):
+    """<family>-<PT|COL>-<instance> names, about twelve instances per family."""
+    families = max(1, count // 12)
+    return [f"Synth{m % families:04d}-{'COL' if (m // families) % 3 == 2 else 'PT'}-{m:06d}" for m in range(count)]
+
+
+def tool_names(count):
+    return [f"Tool{t:02d}" for t in range(count)]
+
+
+def join_chars(chars):
+    """One string per row of a 2D array of single characters."""
+    chars = np.ascontiguousarray(chars, dtype="U1")
+    return chars.view(f"U{chars.shape[1]}").ravel()
+
+
+def examination_lines(rng, exam, width, numeric, models, tools, strength):
+    """The lines of one examination for a chunk of models, tool by tool."""
+    n = len(models)
+    if numeric:
+        truth = rng.integers(1, 10 ** rng.integers(1, 10, size=(n, 1)), size=(n, width)).astype(str)
+    else:
+        truth = np.where(rng.random((n, width)) < 0.5, "T", "F")
+    difficulty = rng.random((n, width)) ** 2
+
+    lines = []
+    for tool, power in zip(tools, strength):
+        present = rng.random(n) >= ABSENT
+        failed = rng.random(n) < FAILED
+        answered = rng.random((n, width)) < power * (1 - difficulty)
+        wrong = answered & (rng.random((n, width)) < WRONG)
+        masks = join_chars(np.where(wrong, "X", np.where(answered, "T", "?")))
+        if numeric:
+            given = np.where(wrong, "0", truth)
+            values = np.where(answered, given, "?")
+            results = [" ".join(row) for row in values.tolist()]
+        else:
+            given = np.where(wrong, np.where(truth == "T", "F", "T"), truth)
+            results = join_chars(np.where(answered, given, "?"))
+        for i in np.flatnonzero(present):
+            if failed[i]:
+                lines.append(f"{tool},{models[i]},{exam},normal:0:0:{'?' * width},{'DNF' if i % 2 else 'DNC'}\n")
+            else:
+                lines.append(f"{tool},{models[i]},{exam},normal:0:{2 * int(answered[i].sum())}:{masks[i]},{results[i]}\n")
+    return lines
+
+
+def write_raw(path, models, tools, formulas=FORMULAS, seed=2025):
+    """Write the raw CSV; returns its number of rows."""
+    rng = np.random.default_rng(seed)
+    strength = rng.uniform(0.3, 0.95, size=len(tools))
+    rows = 0
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for start in range(0, len(models), CHUNK):
+            chunk = models[start:start + CHUNK]
+            for exam, width, numeric in EXAMINATIONS:
+                lines = examination_lines(rng, exam, width or formulas, numeric, chunk, tools, strength)
+                f.write("".join(lines))
+                rows += len(lines)
+    return rows
+
+
+def write_descriptions(path, models, seed=0):
+    """ModelDescriptions.csv of the synthetic models (random net sizes)."""
+    rng = np.random.default_rng(seed)
+    places = rng.integers(5, 10 ** 5, size=len(models))
+    transitions = rng.integers(5, 10 ** 5, size=len(models))
+    arcs = (places + transitions) * rng.integers(2, 6, size=len(models))
+    with open(path, "w") as f:
+        f.write("Model,Places,Transitions,Arcs\n")
+        f.write("".join(f"{m},{p},{t},{a}\n" for m, p, t, a in zip(models, places, transitions, arcs)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write a synthetic raw-result-analysis.csv.")
+    ap.add_argument("-scale", type=float, default=1, help=f"models, in multiples of a 2025 year ({BASE_MODELS} models)")
+    ap.add_argument("-models", type=int, help="number of models (overrides -scale)")
+    ap.add_argument("-tools", type=int, default=BASE_TOOLS, help=f"number of tools (default {BASE_TOOLS})")
+    ap.add_argument("-formulas", type=int, default=FORMULAS, help=f"formulas per examination (default {FORMULAS})")
+    ap.add_argument("-seed", type=int, default=2025, help="random seed (default 2025)")
+    ap.add_argument("-o", default="raw-result-analysis.csv", help="output file")
+    ap.add_argument("-descriptions", help="also write the ModelDescriptions.csv of the models")
+    args = ap.parse_args()
+
+    start_time = time.time()
+    models = model_names(args.models or max(1, round(BASE_MODELS * args.scale)))
+    rows = write_raw(args.o, models, tool_names(args.tools), args.formulas, args.seed)
+    if args.descriptions:
+        write_descriptions(args.descriptions, models)
+    print(f"Processed {len(models)} models, {rows} rows in {time.time() - start_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
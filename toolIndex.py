@@ -0,0 +1,120 @@
+"""Compact tool_index_packed.json next to each tool_index_dict.json.
+
+tool_index_dict.json (written by buildRefinedResults.R or buildCategories.py,
+and read by analyzeINVCEX.R) lists the answers and errors of each tool as
+arrays of decimal strings. The packed file holds the same Index lists for the
+Venn pages, as base64 strings, preceded by a header of list sizes on the
+first line, so that the header is read without parsing the lists:
+
+    {"version":1,"tools":[{"name":"ITS-Tools","answers":1234,"errors":0},...],
+    "answers":["V...",...],"errors":["B...",...]}
+
+Each list takes the shorter of two encodings, told apart by its first letter:
+"B" is a bitmap (bit i-1 of byte (i-1)//8, least significant first, is set
+when Index i is in the list) and "V" the gaps between sorted Index values
+(starting from 0) as LEB128 varints.
+
+Usage: python3 toolIndex.py [category ...]    (default: every category folder)
+"""
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PACKED_VERSION = 1
+CATEGORIES = ['state_space', 'global_properties', 'reachability', 'ctl', 'ltl', 'upper_bounds']
+
+
+def bitmap(indices):
+    bits = np.zeros(int(indices[-1]) if len(indices) else 0, dtype=bool)
+    bits[indices - 1] = True
+    return np.packbits(bits, bitorder='little').tobytes()
+
+
+def varints(indices):
+    """LEB128 encoding of the gaps between the sorted indices."""
+    gaps = np.diff(indices, prepend=0).astype(np.uint64)
+    # 7 bits per byte, the high bit set on every byte but the last of a value
+    width = max(1, (int(gaps.max()).bit_length() + 6) // 7) if len(gaps) else 1
+    shifts = np.arange(width, dtype=np.uint64) * np.uint64(7)
+    groups = (gaps[:, None] >> shifts) & np.uint64(0x7f)
+    lengths = np.maximum(1, (np.floor(np.log2(np.maximum(gaps, 1))).astype(np.int64) // 7) + 1)
+    used = np.arange(width) < lengths[:, None]
+    more = np.arange(width) < lengths[:, None] - 1
+    return (groups | np.where(more, 0x80, 0).astype(np.uint64))[used].astype(np.uint8).tobytes()
+
+
+def encode_list(indices):
+    indices = np.unique(np.asarray(indices, dtype=np.int64))
+    packed = varints(indices)
+    kind = 'V'
+    # a bitmap is shorter for the tools answering more than about one query in eight
+    if len(indices) and int(indices[-1]) // 8 + 1 < len(packed):
+        packed, kind = bitmap(indices), 'B'
+    return kind + base64.b64encode(packed).decode('ascii')
+
+
+def decode_list(text):
+    data = np.frombuffer(base64.b64decode(text[1:]), dtype=np.uint8)
+    if text[0] == 'B':
+        return np.flatnonzero(np.unpackbits(data, bitorder='little')) + 1
+    if len(data) == 0:
+        return np.zeros(0, dtype=np.int64)
+    last = data < 0x80
+    starts = np.flatnonzero(np.r_[True, last[:-1]])
+    # position of each byte in its value
+    position = np.arange(len(data)) - np.repeat(starts, np.diff(np.r_[starts, len(data)]))
+    parts = (data & 0x7f).astype(np.int64) << (7 * position)
+    return np.cumsum(np.add.reduceat(parts, starts))
+
+
+def pack_tool_index(tool_index):
+    """The packed form of a {tool: {"answers": [...], "errors": [...]}} dictionary."""
+    # an empty dictionary is written as [] by jsonlite
+    tool_index = tool_index or {}
+    packed = {'version': PACKED_VERSION, 'tools': [], 'answers': [], 'errors': []}
+    for tool, entry in tool_index.items():
+        packed['tools'].append({'name': tool, 'answers': len(entry['answers']), 'errors': len(entry['errors'])})
+        for field in ('answers', 'errors'):
+            packed[field].append(encode_list(np.asarray(entry[field], dtype=np.int64)))
+    return packed
+
+
+def write_packed(tool_index, path):
+    packed = pack_tool_index(tool_index)
+    lists = {field: packed.pop(field) for field in ('answers', 'errors')}
+    with open(path, 'w') as f:
+        # json.dumps escapes newlines in strings: the header is exactly the first line
+        f.write(json.dumps(packed, separators=(',', ':'))[:-1] + ',\n')
+        f.write(json.dumps(lists, separators=(',', ':'))[1:])
+
+
+def read_header(path):
+    """The [{name, answers, errors}] list sizes of a packed file, from its first line."""
+    with open(path) as f:
+        line = f.readline()
+    # the line ends with the comma before the lists
+    return json.loads(line.rstrip().rstrip(',') + '}')['tools']
+
+
+def pack_category(category):
+    with open(os.path.join(category, 'tool_index_dict.json')) as f:
+        tool_index = json.load(f)
+    write_packed(tool_index, os.path.join(category, 'tool_index_packed.json'))
+    return len(tool_index)
+
+
+def main():
+    categories = sys.argv[1:] or CATEGORIES
+    for category in categories:
+        start_time = time.time()
+        tools = pack_category(category)
+        elapsed_time = time.time() - start_time
+        print(f"Processed {category}: {tools} tools in {elapsed_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
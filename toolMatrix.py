@@ -0,0 +1,80 @@
+"""Bitset tool x query matrix and the Solutions hardness metric.
+
+Python replacement for generate_tool_query_matrix / add_hardness_metric of
+buildRefinedResults.R. Each tool's answers are one packed bitset over the
+queries of a category (bit i-1 set when the tool solved query Index i), the
+tools of a family are OR-ed into one bitset per family, and the number of
+distinct families that solved each query, capped at 3, is computed with a
+bit-sliced saturating counter over whole uint64 words.
+"""
+import numpy as np
+
+# Define tool families
+TOOL_FAMILIES = [["tedd-c", "tedd-s", "tedd"],
+                 ["ITS-Tools", "ITS-Tools.M", "ITS-Tools.L", "ITS-Lola", "LTSMin+red", "Marcie+red", "Smart+red", "LoLa+red", "GreatSPN+red"],
+                 ["M4M.full", "M4M.struct"],
+                 ["Irma.full", "Irma.struct"],
+                 ["Tapaal(EXP)", "Tapaal(PAR)", "Tapaal"],
+                 # ... add more here as needed
+                 ]
+
+# Virtual tools do not count as a solution
+VIRTUAL_TOOLS = {"BVT", "LastYear-gold"}
+
+SOLUTIONS_CAP = 3
+
+
+def tool_family_dict(tools, families=TOOL_FAMILIES):
+    """Family number of every tool: predefined families first, then one family per other tool."""
+    family = {}
+    for i, members in enumerate(families, start=1):
+        for tool in members:
+            family[tool] = i
+    next_family = len(families) + 1
+    for tool in tools:
+        if tool not in family:
+            family[tool] = next_family
+            next_family += 1
+    return family
+
+
+class ToolQueryMatrix:
+    """Packed answer bitsets of a category: one per tool, one per tool family."""
+
+    def __init__(self, answers, n_queries):
+        """answers maps each tool to the 1-based Index of the queries it solved."""
+        self.n_queries = n_queries
+        # whole uint64 words, so the bit operations run 64 queries at a time
+        self.n_words = (n_queries + 63) // 64
+        self.tools = {tool: self.pack(indices) for tool, indices in answers.items()}
+
+    def pack(self, indices):
+        solved = np.zeros(self.n_words * 64, dtype=bool)
+        solved[np.asarray(indices, dtype=np.int64) - 1] = True
+        return np.packbits(solved, bitorder='little').view(np.uint64)
+
+    def unpack(self, bits):
+        return np.unpackbits(bits.view(np.uint8), bitorder='little')[:self.n_queries]
+
+    def families(self, family):
+        """OR the bitsets of the real tools of each family."""
+        bits = {}
+        for tool, tool_bits in self.tools.items():
+            if tool in VIRTUAL_TOOLS:
+                continue
+            f = family[tool]
+            bits[f] = bits[f] | tool_bits if f in bits else tool_bits.copy()
+        return bits
+
+    def solutions(self, family, cap=SOLUTIONS_CAP):
+        """Number of distinct families that solved each query, bounded by cap."""
+        # at_least[k] has the bit of a query set once k+1 families solved it
+        at_least = [np.zeros(self.n_words, dtype=np.uint64) for _ in range(cap)]
+        for bits in self.families(family).values():
+            for k in range(cap - 1, 0, -1):
+                at_least[k] |= at_least[k - 1] & bits
+            at_least[0] |= bits
+        count = np.zeros(self.n_queries, dtype=np.int64)
+        for level in at_least:
+            count += self.unpack(level)
+        return count